@@ -0,0 +1,107 @@
+# backend/asgi.py
+# ASGI entry point. Run with an ASGI server, e.g.:
+#   uvicorn asgi:application --host 0.0.0.0 --port 3001
+#
+# The kernel-bound evaluation endpoints are served natively on the server's
+# event loop, so an in-flight kernel execution costs a coroutine rather than a
+# blocked worker thread. Every other route falls through to the Flask app.
+import json
+import asyncio
+
+from asgiref.wsgi import WsgiToAsgi
+
+from index import app
+from utils.passwordHashing import PASSWORD_HASHER
+from utils.sessionTokens import authorize
+from routes.evaluate import (
+    DATASET_CACHE,
+    KERNEL_POOL,
+    USER_KERNELS,
+    handle_run,
+    handle_start_session,
+    handle_validate,
+)
+
+ASYNC_ROUTES = {
+    "/api/evaluate/session/start": handle_start_session,
+    "/api/evaluate/run": handle_run,
+    "/api/evaluate/validate": handle_validate,
+}
+
+wsgi_application = WsgiToAsgi(app)
+
+
+async def read_json_body(receive):
+    chunks = []
+    while True:
+        message = await receive()
+        chunks.append(message.get("body", b""))
+        if not message.get("more_body"):
+            break
+    raw = b"".join(chunks)
+    return json.loads(raw) if raw else {}
+
+
+async def send_json(send, scope, body, status):
+    payload = json.dumps(body).encode("utf-8")
+    headers = [
+        (b"content-type", b"application/json"),
+        (b"content-length", str(len(payload)).encode()),
+    ]
+    # Mirror the flask_cors configuration in index.py (any origin, credentials allowed).
+    origin = dict(scope.get("headers", [])).get(b"origin")
+    if origin:
+        headers.append((b"access-control-allow-origin", origin))
+        headers.append((b"access-control-allow-credentials", b"true"))
+    await send({"type": "http.response.start", "status": status, "headers": headers})
+    await send({"type": "http.response.body", "body": payload})
+
+
+async def lifespan(receive, send):
+    while True:
+        message = await receive()
+        if message["type"] == "lifespan.startup":
+            PASSWORD_HASHER.start()
+            # Materialize shared datasets before pooled kernels start warming up on them.
+            await asyncio.to_thread(DATASET_CACHE.materialize, KERNEL_POOL.profiles.values())
+            KERNEL_POOL.start()
+            USER_KERNELS.start_reaper()
+            await send({"type": "lifespan.startup.complete"})
+        elif message["type"] == "lifespan.shutdown":
+            KERNEL_POOL.shutdown()
+            PASSWORD_HASHER.shutdown()
+            await send({"type": "lifespan.shutdown.complete"})
+            return
+
+
+async def application(scope, receive, send):
+    if scope["type"] == "lifespan":
+        await lifespan(receive, send)
+        return
+
+    handler = ASYNC_ROUTES.get(scope.get("path", "").rstrip("/"))
+    if scope["type"] == "http" and scope["method"] == "POST" and handler:
+        # Same check as @token_required on the Flask routes.
+        header = dict(scope.get("headers", [])).get(b"authorization", b"").decode("latin-1")
+        auth, error = authorize(header)
+        if error:
+            await send_json(send, scope, *error)
+            return
+        try:
+            data = await read_json_body(receive)
+        except (json.JSONDecodeError, UnicodeDecodeError):
+            data = None
+        if not isinstance(data, dict):
+            await send_json(send, scope, {"error": "Request must be a JSON object"}, 400)
+            return
+        try:
+            body, status = await handler(data, auth)
+        except Exception as e:
+            # Answer like a failed Flask view, with CORS headers, instead of
+            # letting the server send a bare 500 the browser reports as a CORS error.
+            print(f"[ASGI] {scope['path']} failed: {type(e).__name__}: {e}")
+            body, status = {"error": "Internal server error."}, 500
+        await send_json(send, scope, body, status)
+        return
+
+    await wsgi_application(scope, receive, send)
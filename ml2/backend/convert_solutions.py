@@ -0,0 +1,90 @@
+# backend/convert_solutions.py
+# One-shot conversion of csv_similarity solution CSVs to a binary columnar
+# format that compare_csvs memory-maps instead of re-parsing.
+#
+#   python convert_solutions.py                      # convert known solution CSVs to .arrow
+#   python convert_solutions.py --format npy         # or .parquet / .npy (numeric solutions only)
+#   python convert_solutions.py --update-questions   # also repoint solution_file in questions.json
+#   python convert_solutions.py path/to/file.csv ... # convert specific files
+import argparse
+import json
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from utils.questionCatalog import write_questions_file
+from utils.tabularFiles import write_arrow
+
+BASE_DIR = Path(__file__).resolve().parent
+DATASETS_PATH = BASE_DIR / "data" / "datasets"
+QUESTIONS_BASE_PATH = BASE_DIR / "data" / "questions"
+SOLUTION_FILE_NAMES = {"framed_output.csv", "solution_submission.csv", "solution.csv"}
+
+
+def convert(csv_path: Path, fmt: str) -> Path:
+    df = pd.read_csv(csv_path)
+    out_path = csv_path.with_suffix(f".{fmt}")
+    if fmt == "arrow":
+        write_arrow(df, out_path)
+    elif fmt == "parquet":
+        df.to_parquet(out_path, index=False)
+    elif fmt == "npy":
+        # .npy keeps values only (no column names, no strings): fine for direct
+        # (cell-by-cell) comparisons of numeric solutions, nothing else.
+        non_numeric = [name for name, dtype in df.dtypes.items() if not pd.api.types.is_numeric_dtype(dtype)]
+        if non_numeric:
+            raise ValueError(f"non-numeric columns {non_numeric} cannot be stored as .npy; use arrow or parquet")
+        np.save(out_path, df.to_numpy())
+    print(f"Converted {csv_path} -> {out_path.name} ({len(df)} rows)")
+    return out_path
+
+
+def update_questions(converted: dict) -> None:
+    """
+    Points csv_similarity parts whose solution_file was converted at the new
+    file. Parts compared by key_columns keep their CSV when the conversion is
+    .npy, which has no column names to merge on.
+    """
+    for q_file_path in QUESTIONS_BASE_PATH.glob("*/level*/questions.json"):
+        with open(q_file_path, 'r', encoding='utf-8') as f:
+            questions = json.load(f)
+        changed = False
+        for question in questions:
+            for part in question.get("parts", [question]):
+                solution_file = part.get("solution_file")
+                if not solution_file:
+                    continue
+                resolved = (BASE_DIR / solution_file).resolve()
+                if resolved in converted:
+                    if part.get("key_columns") and converted[resolved].suffix == ".npy":
+                        print(f"Keeping {solution_file} for part {part.get('part_id', question.get('id'))}: key_columns need column names")
+                        continue
+                    part["solution_file"] = str(Path(solution_file).with_suffix(converted[resolved].suffix).as_posix())
+                    changed = True
+        if changed:
+            write_questions_file(q_file_path, questions)
+            print(f"Updated {q_file_path.relative_to(BASE_DIR)}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Convert solution CSVs to a memory-mappable binary format.")
+    parser.add_argument("paths", nargs="*", type=Path, help="CSV files to convert (default: known solution files under data/datasets)")
+    parser.add_argument("--format", choices=["arrow", "parquet", "npy"], default="arrow")
+    parser.add_argument("--update-questions", action="store_true", help="Rewrite solution_file references in questions.json")
+    args = parser.parse_args()
+
+    csv_paths = args.paths or sorted(p for p in DATASETS_PATH.rglob("*.csv") if p.name in SOLUTION_FILE_NAMES)
+    converted = {}
+    for csv_path in csv_paths:
+        try:
+            converted[csv_path.resolve()] = convert(csv_path.resolve(), args.format)
+        except Exception as e:
+            print(f"Error converting {csv_path}: {e}")
+
+    if args.update_questions:
+        update_questions(converted)
+
+
+if __name__ == "__main__":
+    main()
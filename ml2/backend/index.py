@@ -1,18 +1,20 @@
 # backend/app.py
-from flask import Flask, send_from_directory
+from flask import Flask, request
 from flask_cors import CORS
 import os
-from pathlib import Path
 
 # Import Blueprints (equivalent to Express routes)
 from routes.auth import auth_bp
 from routes.questions import questions_bp
-from routes.evaluate import evaluation_bp
+from routes.evaluate import evaluation_bp, DATASET_CACHE, KERNEL_POOL, USER_KERNELS
 from routes.users import users_bp
 from routes.admin import admin_bp
 from routes.submissions import submissions_bp
+from utils.passwordHashing import PASSWORD_HASHER
+from utils.staticAssets import StaticAssetIndex
 
-app = Flask(__name__, static_folder="../frontend/dist", static_url_path="")
+# The frontend build is served from memory by the catch-all route below.
+app = Flask(__name__, static_folder=None)
 CORS(app, supports_credentials=True, resources={r"/api/*": {"origins": "*"}})
 
 PORT = 3001
@@ -27,17 +29,33 @@ app.register_blueprint(submissions_bp, url_prefix="/api/submissions")
 
 # --- Serve static assets if in production ---
 if os.getenv("FLASK_ENV") == "production":
-    frontend_dist = Path(__file__).resolve().parent.parent / "frontend" / "dist"
+    STATIC_ASSETS = StaticAssetIndex()
 
     @app.route("/", defaults={"path": ""})
     @app.route("/<path:path>")
     def serve(path):
-        if path != "" and (frontend_dist / path).exists():
-            return send_from_directory(frontend_dist, path)
-        else:
-            return send_from_directory(frontend_dist, "index.html")
+        asset = STATIC_ASSETS.lookup(path)
+        if asset is None:
+            return "Not Found", 404
+        encoding, body = asset.select(request.headers.get("Accept-Encoding", ""))
+        response = app.response_class(body, mimetype=asset.mimetype)
+        if encoding:
+            response.headers["Content-Encoding"] = encoding
+        response.headers["Vary"] = "Accept-Encoding"
+        response.headers["Cache-Control"] = asset.cache_control
+        # One ETag per representation, so caches never mix encodings.
+        response.set_etag(f"{asset.etag}-{encoding}" if encoding else asset.etag)
+        return response.make_conditional(request)
 
 
 if __name__ == "__main__":
+    # With debug=True the reloader runs the app in a child process; only warm
+    # the kernel pool there so the parent doesn't hold idle kernels.
+    if os.environ.get("WERKZEUG_RUN_MAIN") == "true":
+        # Fork the bcrypt workers before the kernel pool starts its threads.
+        PASSWORD_HASHER.start()
+        DATASET_CACHE.materialize(KERNEL_POOL.profiles.values())
+        KERNEL_POOL.start()
+        USER_KERNELS.start_reaper()
     print(f"✅ Backend server running on http://localhost:{PORT}")
     app.run(host="0.0.0.0", port=PORT,debug=True)
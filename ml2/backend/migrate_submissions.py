@@ -0,0 +1,25 @@
+# backend/migrate_submissions.py
+# One-shot import of the legacy per-user data/submissions/<username>.json files
+# into the append-only submission log (data/submissions.db). The server does
+# this automatically the first time it opens an empty log.
+#
+#   python migrate_submissions.py                 # import data/submissions/*.json
+#   python migrate_submissions.py path/to/dir     # import another directory
+# Nothing is imported if the log already holds submissions.
+import argparse
+from pathlib import Path
+
+from utils.submissionStore import SUBMISSIONS_DB_PATH, SUBMISSIONS_PATH, SubmissionStore
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Import per-user submission JSON files into the submission log.")
+    parser.add_argument("submissions_dir", nargs="?", type=Path, default=SUBMISSIONS_PATH)
+    args = parser.parse_args()
+
+    imported, failed = SubmissionStore(SUBMISSIONS_DB_PATH).import_json_dir(args.submissions_dir)
+    print(f"Imported {imported} submissions from {args.submissions_dir} into {SUBMISSIONS_DB_PATH} ({failed} unreadable files)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,25 @@
+# backend/migrate_users.py
+# One-shot import of data/users.json into the SQLite user store (data/users.db).
+# The server also does this automatically the first time it opens an empty
+# database; run this to migrate ahead of a deploy or to merge in another file.
+#
+#   python migrate_users.py                     # import data/users.json
+#   python migrate_users.py path/to/users.json  # import another file
+# Usernames already in the database are skipped.
+import argparse
+from pathlib import Path
+
+from utils.userStore import USERS_DB_PATH, USERS_FILE_PATH, SqliteUserStore
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Import users.json into the SQLite user store.")
+    parser.add_argument("users_file", nargs="?", type=Path, default=USERS_FILE_PATH)
+    args = parser.parse_args()
+
+    created, skipped = SqliteUserStore(USERS_DB_PATH).import_json(args.users_file)
+    print(f"Imported {created} users from {args.users_file} into {USERS_DB_PATH} ({skipped} already present)")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,38 +1,12 @@
-import os
+import io
 import json
 import csv
-import bcrypt
 from pathlib import Path
 from flask import Blueprint, request, jsonify
-from werkzeug.utils import secure_filename
-
-# --- Helper Function (equivalent to buildInitialProgress) ---
-# NOTE: The logic for this function needs to be ported from your 'utils/progressHelper.js'
-# It should scan the 'data/questions' directory and build the initial progress structure.
-# Here is a plausible implementation.
-def build_initial_progress():
-    """
-    Scans the questions directory to build the initial progress structure for a new user.
-    """
-    questions_base_path = Path(__file__).parent.parent / "data" / "questions"
-    progress = {}
-    if not questions_base_path.exists():
-        return progress
-
-    for subject_path in questions_base_path.iterdir():
-        if subject_path.is_dir():
-            subject_name = subject_path.name
-            progress[subject_name] = {}
-            # Sort levels numerically, e.g., level1, level2, level10
-            level_paths = sorted(
-                (p for p in subject_path.iterdir() if p.is_dir()),
-                key=lambda p: int(p.name.replace("level", ""))
-            )
-            for i, level_path in enumerate(level_paths):
-                level_name = level_path.name
-                # Unlock the first level, lock the rest
-                progress[subject_name][level_name] = "unlocked" if i == 0 else "locked"
-    return progress
+from utils.questionCatalog import QUESTION_CATALOG, level_dir_name, write_questions_file
+from utils.userStore import USER_STORE
+from utils.passwordHashing import PASSWORD_HASHER
+from utils.sessionTokens import token_required
 
 # --- Flask Blueprint Setup ---
 # This is the equivalent of 'express.Router()'
@@ -41,20 +15,16 @@ admin_bp = Blueprint('admin_api', __name__)
 # --- Configuration ---
 # Using pathlib for modern, OS-agnostic path handling
 BASE_DIR = Path(__file__).parent.parent # Assumes this file is in a 'routes' subfolder
-USERS_FILE_PATH = BASE_DIR / "data" / "users.json"
 QUESTIONS_BASE_PATH = BASE_DIR / "data" / "questions"
-UPLOAD_FOLDER = BASE_DIR / "uploads"
-
-# Ensure the upload folder exists
-UPLOAD_FOLDER.mkdir(exist_ok=True)
 
 # --- Routes ---
 
 @admin_bp.route('/create-subject', methods=['POST'])
+@token_required('admin')
 def create_subject():
     """
-    Creates the directory structure for a new subject and updates all existing
-    student users with the new subject progress.
+    Creates the directory structure for a new subject. No user is touched:
+    progress for the new levels is derived from the question catalog on read.
     """
     data = request.get_json()
     if not data:
@@ -67,29 +37,14 @@ def create_subject():
         return jsonify({"message": "Valid subject name and number of levels are required."}), 400
 
     try:
-        # 1. Create the folder structure
+        # Create the folder structure
         for i in range(1, num_levels + 1):
             level_path = QUESTIONS_BASE_PATH / subject_name / f"level{i}"
             level_path.mkdir(parents=True, exist_ok=True)
             (level_path / "questions.json").write_text("[]", encoding="utf-8")
+        QUESTION_CATALOG.refresh(force=True)
 
-        # 2. Update all existing users with the new subject
-        with open(USERS_FILE_PATH, 'r+', encoding='utf-8') as f:
-            users_json = json.load(f)
-            for user in users_json.get("users", []):
-                if user.get("role") == "student":
-                    if "progress" not in user:
-                        user["progress"] = {}
-                    user["progress"][subject_name] = {}
-                    for i in range(1, num_levels + 1):
-                        status = "unlocked" if i == 1 else "locked"
-                        user["progress"][subject_name][f"level{i}"] = status
-            
-            f.seek(0) # Rewind file to the beginning
-            json.dump(users_json, f, indent=2)
-            f.truncate() # Remove trailing data if the new content is smaller
-
-        return jsonify({"message": f"Subject '{subject_name}' created and all users updated."}), 201
+        return jsonify({"message": f"Subject '{subject_name}' created."}), 201
 
     except Exception as e:
         print(f"Error creating subject: {e}")
@@ -97,9 +52,15 @@ def create_subject():
 
 
 @admin_bp.route('/upload-users', methods=['POST'])
+@token_required('admin')
 def upload_users():
     """
     Uploads a CSV file to bulk-create new student users.
+
+    Rows are read straight from the upload stream and their passwords are
+    hashed across the bcrypt process pool. All new users are inserted in one
+    transaction: if any row fails, nothing is created. The response lists
+    the outcome of every row ("created" or "skipped" with a reason).
     """
     if 'file' not in request.files:
         return jsonify({"message": "No file part in the request"}), 400
@@ -107,67 +68,81 @@ def upload_users():
     if file.filename == '':
         return jsonify({"message": "No file selected for uploading"}), 400
 
-    filename = secure_filename(file.filename)
-    filepath = UPLOAD_FOLDER / filename
-    
-    try:
-        file.save(filepath)
-
-        with open(USERS_FILE_PATH, 'r+', encoding='utf-8') as f:
-            users_json = json.load(f)
-            existing_usernames = {u['username'] for u in users_json.get("users", [])}
-            initial_progress = build_initial_progress()
-            
-            new_users_from_csv = []
-            with open(filepath, mode='r', encoding='utf-8') as csvfile:
-                reader = csv.DictReader(csvfile)
-                for row in reader:
-                    new_users_from_csv.append(row)
-
-            created_count = 0
-            skipped_count = 0
-            for user_data in new_users_from_csv:
-                username = user_data.get('username')
-                password = user_data.get('password')
-
-                if not username or not password or username in existing_usernames:
-                    skipped_count += 1
-                    continue
-                
-                # Hash the password
-                hashed_password = bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt())
-                
-                new_user = {
-                    "username": username,
-                    "password": hashed_password.decode('utf-8'), # Store as string
-                    "role": "student",
-                    "progress": initial_progress
-                }
-                users_json["users"].append(new_user)
-                existing_usernames.add(username)
-                created_count += 1
+    row_results = []
+    accepted = []  # (row result, username) of rows whose password is being hashed
+
+    def passwords_to_hash():
+        seen_usernames = set()
+        reader = csv.DictReader(io.TextIOWrapper(file.stream, encoding='utf-8'))
+        # Row numbers match the spreadsheet: row 1 is the header
+        for row_number, user_data in enumerate(reader, start=2):
+            username = (user_data.get('username') or '').strip()
+            password = user_data.get('password')
+            result = {"row": row_number, "username": username}
+            row_results.append(result)
+
+            if not username or not password:
+                result.update(status="skipped", reason="missing username or password")
+            elif username in seen_usernames:
+                result.update(status="skipped", reason="duplicate username in file")
+            elif USER_STORE.get_user(username) is not None:
+                result.update(status="skipped", reason="username already exists")
+            else:
+                seen_usernames.add(username)
+                accepted.append((result, username))
+                yield password
 
-            # Write updated data back to the file
-            f.seek(0)
-            json.dump(users_json, f, indent=2)
-            f.truncate()
+    try:
+        new_users = []
+        for i, hashed_password in enumerate(PASSWORD_HASHER.hash_many(passwords_to_hash())):
+            result, username = accepted[i]
+            new_users.append({
+                "username": username,
+                "password": hashed_password,
+                "role": "student",
+                "progress": {}
+            })
+            if (i + 1) % 50 == 0:
+                print(f"[UPLOAD USERS] Hashed {i + 1} passwords")
+
+        # Insert every new user in a single transaction
+        created_usernames, skipped_existing = USER_STORE.create_users(new_users)
+        created = set(created_usernames)
+        for result, username in accepted:
+            if username in created:
+                result["status"] = "created"
+            else:
+                # Created by another request between the check above and the insert
+                result.update(status="skipped", reason="username already exists")
+        if skipped_existing:
+            print(f"[UPLOAD USERS] {skipped_existing} usernames were created by another request during the upload")
+        created_count = len(created)
+        skipped_count = len(row_results) - created_count
 
         return jsonify({
-            "message": f"Upload complete. Created {created_count} new users. Skipped {skipped_count} users."
+            "message": f"Upload complete. Created {created_count} new users. Skipped {skipped_count} users.",
+            "created": created_count,
+            "skipped": skipped_count,
+            "rows": row_results,
         }), 201
 
     except Exception as e:
-        print(f"Error during user upload: {e}")
-        return jsonify({"message": "An error occurred during user upload."}), 500
-    finally:
-        # Ensure the temporary uploaded file is deleted
-        if filepath.exists():
-            filepath.unlink()
+        print(f"Error during user upload, nothing was imported: {e}")
+        return jsonify({
+            "message": "An error occurred during user upload. No users were created.",
+            "rows": row_results,
+        }), 500
+
 
 @admin_bp.route('/upload-questions', methods=['POST'])
+@token_required('admin')
 def upload_questions():
     """
     Uploads a CSV file to bulk-create new questions.
+
+    Rows are streamed and grouped by (subject, level): each target
+    questions.json is loaded once, duplicates are checked against a set of
+    its ids, and each changed file is written once, atomically.
     """
     if 'file' not in request.files:
         return jsonify({"message": "No file part in the request"}), 400
@@ -175,21 +150,14 @@ def upload_questions():
     if file.filename == '':
         return jsonify({"message": "No file selected for uploading"}), 400
 
-    filename = secure_filename(file.filename)
-    filepath = UPLOAD_FOLDER / filename
-
     try:
-        file.save(filepath)
-
-        rows = []
-        with open(filepath, mode='r', encoding='utf-8') as csvfile:
-            reader = csv.DictReader(csvfile)
-            rows = list(reader) # Read all rows into memory
-
+        # (subject, level dir) -> {"questions": [...], "ids": set(), "added": int}
+        levels = {}
         added_count = 0
         skipped_count = 0
 
-        for row in rows:
+        reader = csv.DictReader(io.TextIOWrapper(file.stream, encoding='utf-8'))
+        for row in reader:
             subject = row.get('subject')
             level = row.get('level')
             q_id = row.get('id')
@@ -200,20 +168,25 @@ def upload_questions():
                 skipped_count += 1
                 continue
 
-            q_file_path = QUESTIONS_BASE_PATH / subject / f"level{level}" / "questions.json"
-            
-            # Ensure parent directory exists
-            q_file_path.parent.mkdir(parents=True, exist_ok=True)
-            
-            # Read existing questions, default to empty list if file doesn't exist
-            try:
-                with open(q_file_path, 'r', encoding='utf-8') as f:
-                    questions = json.load(f)
-            except (FileNotFoundError, json.JSONDecodeError):
-                questions = []
-
-            # Check for duplicate question ID
-            if any(q['id'] == q_id for q in questions):
+            key = (subject, level_dir_name(level))
+            level_entry = levels.get(key)
+            if level_entry is None:
+                # Read existing questions once per level, default to empty list
+                q_file_path = QUESTIONS_BASE_PATH / key[0] / key[1] / "questions.json"
+                try:
+                    with open(q_file_path, 'r', encoding='utf-8') as f:
+                        questions = json.load(f)
+                except (FileNotFoundError, json.JSONDecodeError):
+                    questions = []
+                level_entry = levels[key] = {
+                    "path": q_file_path,
+                    "questions": questions,
+                    "ids": {q.get('id') for q in questions},
+                    "added": 0,
+                }
+
+            # Check for duplicate question ID (existing or earlier in the CSV)
+            if q_id in level_entry["ids"]:
                 skipped_count += 1
                 continue
 
@@ -232,19 +205,24 @@ def upload_questions():
                         "expected_output": expected
                     })
 
-            questions.append({
+            level_entry["questions"].append({
                 "id": q_id,
                 "title": title,
                 "description": description,
                 "template": "def function_name(param):\n    # Your code here\n    pass",
                 "test_cases": new_test_cases
             })
-
-            # Write updated questions list back to file
-            with open(q_file_path, 'w', encoding='utf-8') as f:
-                json.dump(questions, f, indent=2)
-            
+            level_entry["ids"].add(q_id)
+            level_entry["added"] += 1
             added_count += 1
+
+        # Write each changed file once
+        for level_entry in levels.values():
+            if level_entry["added"]:
+                write_questions_file(level_entry["path"], level_entry["questions"])
+
+        if added_count:
+            QUESTION_CATALOG.refresh(force=True)
         
         return jsonify({
             "message": f"Upload complete. Added {added_count} new questions. Skipped {skipped_count} questions."
@@ -253,6 +231,3 @@ def upload_questions():
     except Exception as e:
         print(f"Error processing questions CSV: {e}")
         return jsonify({"message": "An error occurred during question upload."}), 500
-    finally:
-        if filepath.exists():
-            filepath.unlink()
\ No newline at end of file
@@ -1,6 +1,9 @@
 import json
+import random
 from pathlib import Path
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, current_app, request, jsonify
+from utils.questionCatalog import QUESTION_CATALOG, serialize, write_questions_file
+from utils.sessionTokens import token_required
 
 # --- Flask Blueprint Setup ---
 questions_bp = Blueprint('questions_api', __name__)
@@ -9,73 +12,72 @@ questions_bp = Blueprint('questions_api', __name__)
 BASE_DIR = Path(__file__).parent.parent
 QUESTIONS_BASE_PATH = BASE_DIR / "data" / "questions"
 
+# Clients may keep responses but must revalidate them; unchanged content
+# comes back as an empty 304 thanks to the ETag.
+QUESTIONS_CACHE_CONTROL = "private, no-cache"
+
+
+def conditional_json(body: bytes, etag: str):
+    """JSON response with a strong ETag; answers If-None-Match with 304 Not Modified."""
+    response = current_app.response_class(body, mimetype="application/json")
+    response.set_etag(etag)
+    response.headers["Cache-Control"] = QUESTIONS_CACHE_CONTROL
+    return response.make_conditional(request)
+
+
 # --- Routes ---
 
 @questions_bp.route('/', methods=['GET'])
 def get_all_subjects_and_levels():
     """
-    GET all available subjects and their levels from the directory structure.
+    GET all available subjects and their levels from the question catalog.
     """
     try:
-        structure = {}
-        # Ensure the base directory exists before iterating
-        if not QUESTIONS_BASE_PATH.exists():
-            return jsonify({}), 200 # Return empty if base path not found
-
-        for subject_path in QUESTIONS_BASE_PATH.iterdir():
-            if subject_path.is_dir():
-                subject_name = subject_path.name
-                
-                # Get all subdirectories that start with 'level'
-                level_paths = [
-                    p for p in subject_path.iterdir() 
-                    if p.is_dir() and p.name.startswith('level')
-                ]
-                
-                # Sort the levels naturally (e.g., level1, level2, level10)
-                level_paths.sort(key=lambda p: int(p.name.replace('level', '')))
-                
-                structure[subject_name] = [p.name for p in level_paths]
-        
-        return jsonify(structure), 200
+        structure = QUESTION_CATALOG.structure()
+        return conditional_json(serialize(structure), QUESTION_CATALOG.structure_etag())
 
     except Exception as e:
         print(f"Error fetching question structure: {e}")
         return jsonify({"message": "Failed to fetch question structure."}), 500
 
-import random
 
 @questions_bp.route('/<string:subject>/<int:level>', methods=['GET'])
 def get_questions_for_level(subject, level):
     """
     GET questions for a specific subject and level.
     For Level 1: return all test-case questions.
-    For Level 2 & 3: return exactly ONE random question.
+    For Level 2 & 3: return exactly ONE question. With ?seed=<sessionId> the
+    pick is deterministic for that session (and cacheable); without a seed
+    it is random.
     """
-    file_path = QUESTIONS_BASE_PATH / subject / f"level{level}" / "questions.json"
-
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            questions = json.load(f)
+        level_entry = QUESTION_CATALOG.get_level(subject, level)
+        if level_entry is None:
+            return jsonify({"message": "Questions not found."}), 404
 
         if level == 1:
             # Return all for test-case based
-            return jsonify(questions), 200
+            return conditional_json(level_entry.body(), level_entry.content_hash)
         else:
-            # Return one random question for similarity-based
-            if not questions:
+            # Return one question for similarity-based
+            if not level_entry.questions:
                 return jsonify({"message": "No questions available"}), 404
-            question = random.choice(questions)
-            return jsonify(question), 200
+            seed = request.args.get('seed')
+            if not seed:
+                question = random.choice(level_entry.questions)
+                response = jsonify(question)
+                response.headers["Cache-Control"] = "no-store"
+                return response, 200
+            index = level_entry.pick_index(seed)
+            return conditional_json(level_entry.question_body(index), f"{level_entry.content_hash}-{index}")
 
-    except FileNotFoundError:
-        return jsonify({"message": "Questions not found."}), 404
     except Exception as e:
         print(f"Error reading questions for {subject}/level{level}: {e}")
         return jsonify({"message": "An error occurred while fetching questions."}), 500
 
 
 @questions_bp.route('/', methods=['POST'])
+@token_required('admin')
 def add_new_question():
     """
     POST to upload a new question to a specific subject/level JSON file.
@@ -116,8 +118,8 @@ def add_new_question():
         questions.append(new_question)
         
         # Write the updated list back to the file
-        with open(file_path, 'w', encoding='utf-8') as f:
-            json.dump(questions, f, indent=2)
+        write_questions_file(file_path, questions)
+        QUESTION_CATALOG.refresh(force=True)
 
         return jsonify({"message": "Question added successfully."}), 201
 
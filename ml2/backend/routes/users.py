@@ -1,40 +1,20 @@
 # backend/routes/users.py
-import json
-import bcrypt
 from flask import Blueprint, request, jsonify
-from pathlib import Path
-from utils.progressHelper import build_initial_progress  # <-- IMPORT
+from utils.userStore import USER_STORE, public_user
+from utils.passwordHashing import PASSWORD_HASHER
+from utils.sessionTokens import token_required
 
 users_bp = Blueprint("users_bp", __name__)
 
-# --- Paths ---
-BASE_DIR = Path(__file__).resolve().parent.parent
-users_file_path = BASE_DIR / "data" / "users.json"
 salt_rounds = 10
 
 
-# --- Helper function to read/write JSON ---
-def load_users():
-    try:
-        with open(users_file_path, "r", encoding="utf-8") as f:
-            return json.load(f)
-    except FileNotFoundError:
-        return {"users": []}
-
-
-def save_users(data):
-    with open(users_file_path, "w", encoding="utf-8") as f:
-        json.dump(data, f, indent=2)
-
-
 # --- GET all users (for admin view) ---
 @users_bp.route("/", methods=["GET"])
+@token_required('admin')
 def get_users():
     try:
-        data = load_users()
-        users = [
-            {k: v for k, v in u.items() if k != "password"} for u in data["users"]
-        ]
+        users = [public_user(u) for u in USER_STORE.list_users()]
         return jsonify(users), 200
     except Exception as e:
         return jsonify({"message": "Failed to fetch users."}), 500
@@ -42,6 +22,7 @@ def get_users():
 
 # --- POST to create a new user (for admin) ---
 @users_bp.route("/create", methods=["POST"])
+@token_required('admin')
 def create_user():
     body = request.get_json()
     username = body.get("username")
@@ -51,31 +32,25 @@ def create_user():
         return jsonify({"message": "Username and password are required."}), 400
 
     try:
-        data = load_users()
-
         # Check if user already exists
-        if any(u["username"] == username for u in data["users"]):
+        if USER_STORE.get_user(username) is not None:
             return jsonify({"message": "Username already exists."}), 409
 
         # Hash password
-        hashed_password = bcrypt.hashpw(password.encode("utf-8"), bcrypt.gensalt(salt_rounds))
-
-        # --- MODIFIED PART: Build full progress object ---
-        initial_progress = build_initial_progress()
+        hashed_password = PASSWORD_HASHER.hash(password, salt_rounds)
 
+        # Progress starts empty; the full object is derived from the catalog
         new_user = {
             "username": username,
-            "password": hashed_password.decode("utf-8"),
+            "password": hashed_password,
             "role": "student",
-            "progress": initial_progress,
+            "progress": {},
         }
-        # --- END MODIFIED PART ---
 
-        data["users"].append(new_user)
-        save_users(data)
+        if not USER_STORE.create_user(new_user):
+            return jsonify({"message": "Username already exists."}), 409
 
-        user_to_return = {k: v for k, v in new_user.items() if k != "password"}
-        return jsonify({"message": "User created successfully!", "user": user_to_return}), 201
+        return jsonify({"message": "User created successfully!", "user": public_user(new_user)}), 201
 
     except Exception as e:
         print("Error creating user:", e)
@@ -0,0 +1,36 @@
+# backend/serve.py
+# Production entry point: several uvicorn worker processes serving asgi:application.
+#
+#   python serve.py                    # one worker per CPU core on 0.0.0.0:3001
+#   python serve.py --workers 4
+#   WEB_CONCURRENCY=8 python serve.py
+#
+# Kernel sessions are published in a shared registry (data/kernels.db), so a
+# /run or /validate can land on any worker: it attaches to the session's
+# kernel through the stored connection info. The kernel pool is split across
+# the workers unless KERNEL_POOL_SIZE is set explicitly (it is then per worker).
+import os
+import argparse
+
+import uvicorn
+
+DEFAULT_TOTAL_POOL_SIZE = 8
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the backend with multiple worker processes.")
+    parser.add_argument("--host", default=os.getenv("HOST", "0.0.0.0"))
+    parser.add_argument("--port", type=int, default=int(os.getenv("PORT", "3001")))
+    parser.add_argument("--workers", type=int, default=int(os.getenv("WEB_CONCURRENCY", str(os.cpu_count() or 1))))
+    args = parser.parse_args()
+
+    # Set before the workers start so every worker process inherits them.
+    os.environ.setdefault("FLASK_ENV", "production")
+    os.environ.setdefault("KERNEL_POOL_SIZE", str(max(1, DEFAULT_TOTAL_POOL_SIZE // args.workers)))
+
+    print(f"✅ Backend serving on http://{args.host}:{args.port} with {args.workers} workers")
+    uvicorn.run("asgi:application", host=args.host, port=args.port, workers=args.workers, lifespan="on")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+# backend/tests/conftest.py
+# Run from ml2/backend:  python -m pytest tests
+import os
+import sys
+import json
+from pathlib import Path
+
+import pytest
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BACKEND_DIR))
+
+# Set before any utils module is imported: no session secret written to data/,
+# and the module-level USER_STORE opens the read-only users.json store
+# instead of creating data/users.db.
+os.environ.setdefault("SESSION_SECRET", "test-secret")
+os.environ.setdefault("USER_STORE", "json")
+
+
+def write_questions(base_path: Path, subject: str, level: str, questions) -> Path:
+    """Writes data/questions/<subject>/<level>/questions.json under base_path."""
+    file_path = base_path / subject / level / "questions.json"
+    file_path.parent.mkdir(parents=True, exist_ok=True)
+    file_path.write_text(json.dumps(questions), encoding="utf-8")
+    return file_path
+
+
+@pytest.fixture
+def questions_path(tmp_path):
+    """A small question tree: ml with levels 1-2, nlp with level 1."""
+    base_path = tmp_path / "questions"
+    write_questions(base_path, "ml", "level1", [{"id": "q1", "parts": [{"part_id": "a"}, {"part_id": "b"}]}])
+    write_questions(base_path, "ml", "level2", [{"id": "q2"}, {"id": "q3"}])
+    write_questions(base_path, "nlp", "level1", [{"id": "q4"}])
+    return base_path
+
+
+@pytest.fixture
+def catalog(questions_path, monkeypatch):
+    """A QuestionCatalog over questions_path, installed wherever the app looks it up."""
+    from utils import questionCatalog, progressHelper, userStore
+    catalog = questionCatalog.QuestionCatalog(questions_path)
+    monkeypatch.setattr(questionCatalog, "QUESTION_CATALOG", catalog)
+    monkeypatch.setattr(progressHelper, "QUESTION_CATALOG", catalog)
+    monkeypatch.setattr(userStore, "QUESTION_CATALOG", catalog)
+    return catalog
@@ -0,0 +1,96 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from utils.csvStreaming import compare_csvs_streaming, count_csv_rows
+
+
+def in_memory_compare(student_path, solution_path, threshold=0.8):
+    """The direct branch of compare_csvs: whole frames, cell by cell."""
+    try:
+        df_student, df_solution = pd.read_csv(student_path), pd.read_csv(solution_path)
+    except pd.errors.EmptyDataError:
+        return False, 0.0
+    if df_student.shape != df_solution.shape:
+        return False, 0.0
+    score = (df_student.values == df_solution.values).sum() / df_student.size * 100 if df_student.size else 100.0
+    return score >= threshold * 100, score
+
+
+def write_csv(path, df):
+    df.to_csv(path, index=False)
+    return path
+
+
+@pytest.fixture
+def solution(tmp_path):
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame({"a": rng.integers(0, 5, 95), "b": rng.integers(0, 5, 95), "label": ["x"] * 95})
+    return write_csv(tmp_path / "solution.csv", df), df
+
+
+def test_count_csv_rows_matches_pandas(tmp_path):
+    path = tmp_path / "quoted.csv"
+    path.write_text('a,b\n1,"two\nlines"\n\n3,4\n', encoding="utf-8")
+    assert count_csv_rows(path) == len(pd.read_csv(path)) == 2
+
+    (tmp_path / "empty.csv").write_text("", encoding="utf-8")
+    (tmp_path / "header.csv").write_text("a,b\n", encoding="utf-8")
+    assert count_csv_rows(tmp_path / "empty.csv") == 0
+    assert count_csv_rows(tmp_path / "header.csv") == 0
+
+
+@pytest.mark.parametrize("changed_rows", [0, 3, 10, 40, 95])
+@pytest.mark.parametrize("chunk_rows", [7, 10, 1000])
+def test_final_verdict_matches_the_in_memory_comparison(tmp_path, solution, changed_rows, chunk_rows):
+    solution_path, df = solution
+    student = df.copy()
+    student.loc[: changed_rows - 1, "a"] = -1
+    student_path = write_csv(tmp_path / "student.csv", student)
+
+    passed, score = compare_csvs_streaming(student_path, solution_path, chunk_rows=chunk_rows)
+    expected_passed, expected_score = in_memory_compare(student_path, solution_path)
+    assert passed == expected_passed
+    if passed:
+        # An early pass reports the score already guaranteed, never more than the final one.
+        assert score <= expected_score + 1e-9
+    else:
+        assert score >= expected_score - 1e-9
+
+
+@pytest.mark.parametrize("student_rows", [0, 50, 94, 96, 200])
+@pytest.mark.parametrize("chunk_rows", [7, 95, 1000])
+def test_row_count_mismatch_fails(tmp_path, solution, student_rows, chunk_rows):
+    solution_path, df = solution
+    student = pd.concat([df] * 3).head(student_rows)
+    student_path = write_csv(tmp_path / "student.csv", student)
+
+    assert compare_csvs_streaming(student_path, solution_path, chunk_rows=chunk_rows) == (False, 0.0)
+
+
+def test_extra_rows_fail_even_when_the_threshold_is_met_early(tmp_path, solution):
+    solution_path, df = solution
+    student_path = write_csv(tmp_path / "student.csv", pd.concat([df, df.head(5)]))
+
+    assert compare_csvs_streaming(student_path, solution_path, chunk_rows=10) == (False, 0.0)
+
+
+def test_different_columns_fail(tmp_path, solution):
+    solution_path, df = solution
+    student_path = write_csv(tmp_path / "student.csv", df.drop(columns=["label"]))
+
+    assert compare_csvs_streaming(student_path, solution_path) == (False, 0.0)
+
+
+def test_header_only_solution(tmp_path):
+    solution_path = tmp_path / "solution.csv"
+    solution_path.write_text("a,b\n", encoding="utf-8")
+    header_only = tmp_path / "header.csv"
+    header_only.write_text("a,b\n", encoding="utf-8")
+    with_rows = write_csv(tmp_path / "rows.csv", pd.DataFrame({"a": [1], "b": [2]}))
+    empty = tmp_path / "empty.csv"
+    empty.write_text("", encoding="utf-8")
+
+    assert compare_csvs_streaming(header_only, solution_path) == (True, 100.0)
+    assert compare_csvs_streaming(with_rows, solution_path) == (False, 0.0)
+    assert compare_csvs_streaming(empty, solution_path) == (False, 0.0)
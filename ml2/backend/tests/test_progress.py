@@ -0,0 +1,91 @@
+import sqlite3
+
+from conftest import write_questions
+from utils.progressHelper import derive_progress, is_default_status, progress_deltas
+from utils.userStore import SqliteUserStore
+
+
+def test_is_default_status():
+    assert is_default_status("level1", "unlocked")
+    assert is_default_status("level2", "locked")
+    assert not is_default_status("level1", "locked")
+    assert not is_default_status("level2", "unlocked")
+    assert not is_default_status("level1", "completed")
+
+
+def test_progress_deltas_keep_only_non_defaults():
+    full = {
+        "ml": {"level1": "completed", "level2": "unlocked"},
+        "nlp": {"level1": "unlocked", "level2": "locked"},
+        "ds": {"level1": "locked"},
+    }
+    assert progress_deltas(full) == {
+        "ml": {"level1": "completed", "level2": "unlocked"},
+        "ds": {"level1": "locked"},
+    }
+    assert progress_deltas(None) == {}
+
+
+def test_derive_progress_fills_in_the_catalog(catalog):
+    assert derive_progress({}) == {
+        "ml": {"level1": "unlocked", "level2": "locked"},
+        "nlp": {"level1": "unlocked"},
+    }
+    assert derive_progress({"ml": {"level1": "completed", "level2": "unlocked"}, "nlp": {"level1": "locked"}}) == {
+        "ml": {"level1": "completed", "level2": "unlocked"},
+        "nlp": {"level1": "locked"},
+    }
+
+
+def test_derive_progress_ignores_unknown_subjects_and_levels(catalog):
+    progress = derive_progress({"gone": {"level1": "completed"}, "ml": {"level9": "completed"}})
+    assert "gone" not in progress
+    assert "level9" not in progress["ml"]
+
+
+def test_new_subjects_and_levels_show_up_without_touching_users(catalog, questions_path):
+    write_questions(questions_path, "ml", "level3", [])
+    write_questions(questions_path, "cv", "level1", [])
+    catalog.refresh(force=True)
+    progress = derive_progress({"ml": {"level1": "completed", "level2": "completed"}})
+    assert progress["ml"]["level3"] == "locked"
+    assert progress["cv"] == {"level1": "unlocked"}
+
+
+def _insert_full_progress_map(db_path):
+    """A users.db as written before only deltas were stored: every level, defaults included."""
+    conn = sqlite3.connect(db_path)
+    conn.execute("PRAGMA user_version = 0")
+    conn.execute("INSERT INTO users (username, password) VALUES ('ana', 'hash')")
+    conn.executemany(
+        "INSERT INTO progress (username, subject, level, status) VALUES ('ana', ?, ?, ?)",
+        [("ml", "level1", "unlocked"), ("ml", "level2", "locked"),
+         ("nlp", "level1", "locked"), ("ds", "level1", "completed"), ("ds", "level2", "unlocked")],
+    )
+    conn.commit()
+    conn.close()
+
+
+def test_compaction_keeps_an_explicitly_locked_level1(tmp_path, catalog):
+    db_path = tmp_path / "users.db"
+    SqliteUserStore(db_path)
+    _insert_full_progress_map(db_path)
+
+    store = SqliteUserStore(db_path)
+    assert store.get_user("ana")["progress"] == {
+        "nlp": {"level1": "locked"},
+        "ds": {"level1": "completed", "level2": "unlocked"},
+    }
+
+
+def test_compaction_runs_once(tmp_path, catalog):
+    db_path = tmp_path / "users.db"
+    SqliteUserStore(db_path)
+    _insert_full_progress_map(db_path)
+    SqliteUserStore(db_path)
+
+    conn = sqlite3.connect(db_path)
+    conn.execute("INSERT INTO progress (username, subject, level, status) VALUES ('ana', 'ml', 'level2', 'locked')")
+    conn.commit()
+    conn.close()
+    assert SqliteUserStore(db_path).get_user("ana")["progress"]["ml"] == {"level2": "locked"}
@@ -0,0 +1,81 @@
+import hashlib
+
+import pytest
+from flask import Flask
+
+from conftest import write_questions
+from routes import questions
+from utils.questionCatalog import serialize
+
+
+@pytest.fixture
+def client(catalog, monkeypatch):
+    monkeypatch.setattr(questions, "QUESTION_CATALOG", catalog)
+    app = Flask(__name__)
+    app.register_blueprint(questions.questions_bp, url_prefix="/api/questions")
+    return app.test_client()
+
+
+def test_structure_etag_is_the_hash_of_the_structure(catalog, questions_path):
+    etag = catalog.structure_etag()
+    assert etag == hashlib.sha256(serialize(catalog.structure())).hexdigest()
+
+    write_questions(questions_path, "ml", "level1", [{"id": "edited"}])
+    catalog.refresh(force=True)
+    assert catalog.structure_etag() == etag
+
+    write_questions(questions_path, "ml", "level3", [])
+    catalog.refresh(force=True)
+    assert catalog.structure_etag() != etag
+
+
+def test_structure_revalidates_with_304(client, catalog, questions_path):
+    response = client.get("/api/questions/")
+    assert response.status_code == 200
+    assert response.get_json() == {"ml": ["level1", "level2"], "nlp": ["level1"]}
+    assert response.headers["Cache-Control"] == questions.QUESTIONS_CACHE_CONTROL
+    etag = response.headers["ETag"]
+
+    revalidated = client.get("/api/questions/", headers={"If-None-Match": etag})
+    assert (revalidated.status_code, revalidated.data) == (304, b"")
+
+    write_questions(questions_path, "cv", "level1", [])
+    catalog.refresh(force=True)
+    changed = client.get("/api/questions/", headers={"If-None-Match": etag})
+    assert changed.status_code == 200
+    assert changed.headers["ETag"] != etag
+
+
+def test_level1_etag_is_the_file_hash(client, catalog, questions_path):
+    response = client.get("/api/questions/ml/1")
+    assert response.status_code == 200
+    assert response.get_json() == [{"id": "q1", "parts": [{"part_id": "a"}, {"part_id": "b"}]}]
+    expected = hashlib.sha256((questions_path / "ml" / "level1" / "questions.json").read_bytes()).hexdigest()
+    assert response.headers["ETag"] == f'"{expected}"'
+    assert client.get("/api/questions/ml/1", headers={"If-None-Match": f'"{expected}"'}).status_code == 304
+
+
+def test_seeded_pick_is_stable_and_cacheable(client, catalog):
+    level = catalog.get_level("ml", 2)
+    first = client.get("/api/questions/ml/2?seed=session-1")
+    index = level.pick_index("session-1")
+    assert first.get_json() == level.questions[index]
+    assert first.headers["ETag"] == f'"{level.content_hash}-{index}"'
+
+    for _ in range(3):
+        assert client.get("/api/questions/ml/2?seed=session-1").get_json() == first.get_json()
+    revalidated = client.get("/api/questions/ml/2?seed=session-1", headers={"If-None-Match": first.headers["ETag"]})
+    assert revalidated.status_code == 304
+
+
+def test_unseeded_pick_is_not_cached(client):
+    response = client.get("/api/questions/ml/2")
+    assert response.status_code == 200
+    assert response.get_json()["id"] in ("q2", "q3")
+    assert response.headers["Cache-Control"] == "no-store"
+    assert "ETag" not in response.headers
+
+
+def test_missing_level_is_404(client):
+    assert client.get("/api/questions/ml/9").status_code == 404
+    assert client.get("/api/questions/cv/1").status_code == 404
@@ -0,0 +1,87 @@
+import pytest
+from flask import Flask, g, jsonify
+
+from utils import sessionTokens
+from utils.sessionTokens import authorize, issue_token, token_required, verify_token
+
+STUDENT = {"username": "ana", "role": "student"}
+
+
+def bearer(user=STUDENT):
+    return f"Bearer {issue_token(user)}"
+
+
+def test_token_round_trip():
+    claims = verify_token(issue_token(STUDENT))
+    assert (claims["sub"], claims["role"]) == ("ana", "student")
+
+
+def test_role_defaults_to_student():
+    assert verify_token(issue_token({"username": "ana"}))["role"] == "student"
+
+
+def test_tampered_token_is_rejected():
+    payload, _, signature = issue_token(STUDENT).partition(".")
+    admin_payload, _, _ = issue_token({"username": "ana", "role": "admin"}).partition(".")
+    assert verify_token(f"{admin_payload}.{signature}") is None
+    assert verify_token(f"{payload}.{signature[:-2]}") is None
+    assert verify_token(payload) is None
+    assert verify_token("") is None
+
+
+def test_expired_token_is_rejected(monkeypatch):
+    monkeypatch.setattr(sessionTokens, "SESSION_TOKEN_TTL", -1)
+    assert verify_token(issue_token(STUDENT)) is None
+
+
+def test_authorize_missing_token():
+    assert authorize("") == (None, ({"message": "Authentication required.", "tokenExpired": False}, 401))
+    assert authorize(None)[1][1] == 401
+
+
+def test_authorize_invalid_or_expired_token(monkeypatch):
+    assert authorize("Bearer not-a-token")[1] == ({"message": "Authentication required.", "tokenExpired": True}, 401)
+    monkeypatch.setattr(sessionTokens, "SESSION_TOKEN_TTL", -1)
+    assert authorize(bearer())[1][0]["tokenExpired"] is True
+
+
+def test_authorize_requires_bearer_scheme():
+    assert authorize(f"Basic {issue_token(STUDENT)}")[1][1] == 401
+
+
+def test_authorize_checks_the_role():
+    assert authorize(bearer(), ("admin",)) == (None, ({"message": "Not allowed."}, 403))
+    claims, error = authorize(bearer(), ("admin", "student"))
+    assert error is None and claims["sub"] == "ana"
+    assert authorize(bearer())[1] is None
+
+
+@pytest.fixture
+def client():
+    app = Flask(__name__)
+
+    @app.route("/me")
+    @token_required()
+    def me():
+        return jsonify(username=g.auth["sub"])
+
+    @app.route("/admin")
+    @token_required("admin")
+    def admin():
+        return jsonify(ok=True)
+
+    return app.test_client()
+
+
+def test_token_required(client):
+    assert client.get("/me").status_code == 401
+    response = client.get("/me", headers={"Authorization": bearer()})
+    assert (response.status_code, response.get_json()) == (200, {"username": "ana"})
+
+    assert client.get("/admin", headers={"Authorization": bearer()}).status_code == 403
+    admin = bearer({"username": "root", "role": "admin"})
+    assert client.get("/admin", headers={"Authorization": admin}).status_code == 200
+
+    response = client.get("/me", headers={"Authorization": "Bearer stale"})
+    assert response.status_code == 401
+    assert response.get_json()["tokenExpired"] is True
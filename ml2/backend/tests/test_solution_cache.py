@@ -0,0 +1,55 @@
+import os
+
+import pandas as pd
+import pytest
+
+from utils.solutionCache import SolutionCache
+
+
+@pytest.fixture
+def solution_csv(tmp_path):
+    path = tmp_path / "solution.csv"
+    pd.DataFrame({"Id": [3, 1, 2], "SalePrice": [30.0, 10.0, 20.0]}).to_csv(path, index=False)
+    return path
+
+
+def test_parsed_once_until_the_file_changes(solution_csv):
+    cache = SolutionCache()
+    first = cache.get(solution_csv)
+    assert cache.get(solution_csv) is first
+    assert (cache.stats()["hits"], cache.stats()["misses"]) == (1, 1)
+
+    pd.DataFrame({"Id": [1], "SalePrice": [99.0]}).to_csv(solution_csv, index=False)
+    stat = solution_csv.stat()
+    os.utime(solution_csv, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    reloaded = cache.get(solution_csv)
+    assert reloaded is not first
+    assert reloaded["SalePrice"].tolist() == [99.0]
+
+
+def test_indexed_frame_keeps_the_key_as_a_column(solution_csv):
+    indexed = SolutionCache().get_indexed(solution_csv, "Id")
+    assert indexed.index.tolist() == [3, 1, 2]
+    assert indexed.index.name is None
+    assert indexed.loc[1, "SalePrice"] == 10.0
+    assert indexed["Id"].tolist() == [3, 1, 2]
+
+
+def test_indexed_by_missing_column_raises(solution_csv):
+    with pytest.raises(KeyError):
+        SolutionCache().get_indexed(solution_csv, "Missing")
+
+
+def test_least_recently_used_frames_are_evicted(tmp_path):
+    paths = []
+    for name in ("a", "b", "c"):
+        path = tmp_path / f"{name}.csv"
+        pd.DataFrame({"x": range(1000)}).to_csv(path, index=False)
+        paths.append(path)
+    cache = SolutionCache(max_mb=0)  # every frame is over budget: only the newest stays
+
+    for path in paths:
+        cache.get(path)
+    assert cache.stats()["entries"] == 1
+    cache.get(paths[-1])
+    assert cache.stats()["hits"] == 1
@@ -0,0 +1,120 @@
+import json
+import sqlite3
+
+import pytest
+
+from utils.submissionStore import SubmissionStore, decode_cursor, encode_cursor
+
+
+@pytest.fixture
+def store(tmp_path):
+    return SubmissionStore(tmp_path / "submissions.db")
+
+
+def submission(subject, level, status, minute):
+    return {"subject": subject, "level": level, "status": status, "timestamp": f"2025-01-01T10:{minute:02d}:00"}
+
+
+def fill(store):
+    """Three students, two levels; ana retries ml/level1 after failing it."""
+    store.append("ana", submission("ml", "level1", "failed", 1))
+    store.append("ben", submission("ml", "level1", "passed", 2))
+    store.append("ana", submission("ml", "level1", "passed", 3))
+    store.append("cy", submission("ml", "level2", "failed", 4))
+    store.append("ana", submission("ml", "level2", "passed", 4))
+
+
+def read_all_pages(store, **filters):
+    seen, cursor = [], None
+    while True:
+        page, cursor = store.page(cursor=cursor, **filters)
+        seen.extend(page)
+        if cursor is None:
+            return seen
+
+
+def test_cursor_round_trip():
+    assert decode_cursor(encode_cursor("2025-01-01T10:00:00", 42)) == ("2025-01-01T10:00:00", 42)
+
+
+@pytest.mark.parametrize("cursor", ["not base64!", "bm8tc2VwYXJhdG9y", "MjAyNXxub3QtYW4taWQ="])
+def test_malformed_cursor_raises_value_error(cursor):
+    with pytest.raises(ValueError):
+        decode_cursor(cursor)
+
+
+def test_append_and_for_user(store):
+    assert store.is_empty()
+    fill(store)
+    assert not store.is_empty()
+    assert [s["status"] for s in store.for_user("ana")] == ["failed", "passed", "passed"]
+    assert store.for_user("nobody") == []
+
+
+def test_level_summary_counts_students_once(store):
+    fill(store)
+    assert store.level_summary() == {
+        "ml": {
+            "level1": {"attempts": 3, "passed": 2, "failed": 1, "students": 2},
+            "level2": {"attempts": 2, "passed": 1, "failed": 1, "students": 2},
+        }
+    }
+
+
+@pytest.mark.parametrize("limit", [1, 2, 3, 50])
+def test_pages_are_newest_first_without_gaps_or_duplicates(store, limit):
+    fill(store)
+    seen = read_all_pages(store, limit=limit)
+    assert [(s["username"], s["timestamp"]) for s in seen] == [
+        ("ana", "2025-01-01T10:04:00"),
+        ("cy", "2025-01-01T10:04:00"),
+        ("ana", "2025-01-01T10:03:00"),
+        ("ben", "2025-01-01T10:02:00"),
+        ("ana", "2025-01-01T10:01:00"),
+    ]
+
+
+def test_page_filters(store):
+    fill(store)
+    assert [s["username"] for s in read_all_pages(store, level="level1", status="passed", limit=1)] == ["ana", "ben"]
+    assert read_all_pages(store, subject="nlp") == []
+
+
+def test_latest_only_returns_each_students_last_attempt(store):
+    fill(store)
+    latest = read_all_pages(store, subject="ml", level="level1", latest_only=True, limit=1)
+    assert [(s["username"], s["status"]) for s in latest] == [("ana", "passed"), ("ben", "passed")]
+    assert [s["username"] for s in read_all_pages(store, status="failed", latest_only=True)] == ["cy"]
+
+
+def test_rebuild_index_matches_incremental_counts(store):
+    fill(store)
+    incremental = store.level_summary()
+    latest = read_all_pages(store, latest_only=True)
+    store.rebuild_index()
+    assert store.level_summary() == incremental
+    assert read_all_pages(store, latest_only=True) == latest
+
+
+def test_index_is_rebuilt_for_a_log_written_without_it(tmp_path):
+    db_path = tmp_path / "submissions.db"
+    fill(SubmissionStore(db_path))
+    conn = sqlite3.connect(db_path)
+    conn.execute("DELETE FROM submission_latest")
+    conn.execute("DELETE FROM submission_levels")
+    conn.commit()
+    conn.close()
+
+    assert SubmissionStore(db_path).level_summary()["ml"]["level1"]["attempts"] == 3
+
+
+def test_import_json_dir(store, tmp_path):
+    legacy = tmp_path / "legacy"
+    legacy.mkdir()
+    (legacy / "ana.json").write_text(json.dumps([submission("ml", "level1", "passed", 1), "junk"]), encoding="utf-8")
+    (legacy / "ben.json").write_text(json.dumps([submission("ml", "level1", "failed", 2)]), encoding="utf-8")
+    (legacy / "broken.json").write_text("{", encoding="utf-8")
+
+    assert store.import_json_dir(legacy) == (2, 1)
+    assert store.level_summary()["ml"]["level1"]["students"] == 2
+    assert store.import_json_dir(legacy) == (0, 0)
@@ -0,0 +1,77 @@
+import json
+
+import pytest
+
+from utils.userStore import JsonUserStore, SqliteUserStore, UserStore, public_user
+
+
+@pytest.fixture(params=["sqlite", "json"])
+def store(request, tmp_path, catalog):
+    if request.param == "sqlite":
+        return SqliteUserStore(tmp_path / "users.db")
+    return JsonUserStore(tmp_path / "users.json")
+
+
+def student(username, **progress):
+    return {"username": username, "password": "hash", "role": "student", "progress": progress}
+
+
+def test_user_store_is_abstract():
+    with pytest.raises(TypeError):
+        UserStore()
+
+
+def test_create_users_reports_who_was_inserted(store):
+    assert store.create_users([student("ana"), student("ben")]) == (["ana", "ben"], 0)
+    assert store.create_users([student("ana"), student("cy")]) == (["cy"], 1)
+    assert store.create_user(student("ana")) is False
+    assert store.create_user(student("dee")) is True
+    assert [user["username"] for user in store.list_users()] == ["ana", "ben", "cy", "dee"]
+
+
+def test_get_user_round_trips_extra_fields(store):
+    store.create_user(dict(student("ana"), email="ana@example.com"))
+    user = store.get_user("ana")
+    assert user["email"] == "ana@example.com"
+    assert user["password"] == "hash"
+    assert store.get_user("nobody") is None
+
+
+def test_only_progress_deltas_are_stored(store):
+    store.create_user(student("ana", ml={"level1": "unlocked", "level2": "locked"}, nlp={"level1": "completed"}))
+    assert store.get_user("ana")["progress"] == {"nlp": {"level1": "completed"}}
+
+
+def test_complete_level_unlocks_the_next_level(store):
+    store.create_user(student("ana"))
+    user = store.complete_level("ana", "ml", 1)
+    assert user["progress"]["ml"] == {"level1": "completed", "level2": "unlocked"}
+    assert public_user(user)["progress"]["ml"] == {"level1": "completed", "level2": "unlocked"}
+    assert store.complete_level("nobody", "ml", 1) is None
+
+
+def test_complete_level_does_not_unlock_a_level_the_subject_lacks(store):
+    store.create_user(student("ana"))
+    store.complete_level("ana", "ml", 2)
+    assert store.get_user("ana")["progress"]["ml"] == {"level2": "completed"}
+
+
+def test_completing_a_level_twice_keeps_the_next_one_completed(store):
+    store.create_user(student("ana"))
+    store.complete_level("ana", "ml", 1)
+    store.complete_level("ana", "ml", 2)
+    store.complete_level("ana", "ml", 1)
+    assert store.get_user("ana")["progress"]["ml"] == {"level1": "completed", "level2": "completed"}
+
+
+def test_public_user_drops_the_password(store):
+    store.create_user({"username": "root", "password": "hash", "role": "admin"})
+    assert "password" not in public_user(store.get_user("root"))
+
+
+def test_sqlite_import_json(tmp_path, catalog):
+    users_file = tmp_path / "users.json"
+    users_file.write_text(json.dumps({"users": [student("ana"), student("ben")]}), encoding="utf-8")
+    store = SqliteUserStore(tmp_path / "users.db")
+    assert store.import_json(users_file) == (2, 0)
+    assert store.import_json(users_file) == (0, 2)
@@ -0,0 +1,60 @@
+from utils.validationCache import ValidationCache, normalize_code
+
+QUESTION = {"id": "q1", "test_cases": [{"input": "1", "output": "1"}]}
+
+
+def make_key(code="print(1)", question=QUESTION, part_id=None):
+    return ValidationCache.make_key("ml", 1, "q1", part_id, code, question)
+
+
+def test_normalize_code_ignores_line_endings_and_trailing_whitespace():
+    assert normalize_code("a = 1  \r\nprint(a)\r\n\n") == "a = 1\nprint(a)"
+    assert normalize_code("  a = 1") == "  a = 1"  # leading indentation is significant
+
+
+def test_key_ignores_cosmetic_edits_but_not_code_or_question_changes():
+    assert make_key("print(1)") == make_key("print(1)   \r\n")
+    assert make_key("print(1)") != make_key("print(2)")
+    assert make_key() != make_key(question=dict(QUESTION, test_cases=[]))
+    assert make_key() != make_key(part_id="a")
+
+
+def test_hit_returns_a_copy():
+    cache = ValidationCache()
+    cache.put(make_key(), [True, False], level_version=1)
+
+    results = cache.get(make_key(), level_version=1)
+    assert results == [True, False]
+    results.append(True)
+    assert cache.get(make_key(), level_version=1) == [True, False]
+    assert cache.stats()["hits"] == 2
+
+
+def test_changed_level_version_drops_the_level():
+    cache = ValidationCache()
+    cache.put(make_key(), [True], level_version=1)
+    other_level = ValidationCache.make_key("ml", 2, "q1", None, "print(1)", QUESTION)
+    cache.put(other_level, [False], level_version=7)
+
+    assert cache.get(make_key(), level_version=2) is None
+    assert cache.get(other_level, level_version=7) == [False]
+    assert cache.stats()["invalidations"] == 1
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = ValidationCache(max_entries=2)
+    first, second, third = make_key("a"), make_key("b"), make_key("c")
+    cache.put(first, [True], 1)
+    cache.put(second, [True], 1)
+    cache.get(first, 1)
+    cache.put(third, [True], 1)
+
+    assert cache.get(second, 1) is None
+    assert cache.get(first, 1) == [True]
+    assert cache.get(third, 1) == [True]
+
+
+def test_disabled_cache_stores_nothing():
+    cache = ValidationCache(max_entries=0)
+    cache.put(make_key(), [True], 1)
+    assert cache.get(make_key(), 1) is None
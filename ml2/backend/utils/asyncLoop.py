@@ -0,0 +1,32 @@
+# backend/utils/asyncLoop.py
+import asyncio
+import threading
+from typing import Any, Coroutine, Optional
+
+# --- One event loop shared by every request ---
+# WSGI views used to call asyncio.run() per kernel execution, creating and
+# tearing down a whole loop each time. Instead, a single loop runs forever on
+# a daemon thread and views submit their coroutines to it.
+_LOOP: Optional[asyncio.AbstractEventLoop] = None
+_LOOP_LOCK = threading.Lock()
+
+
+def get_shared_loop() -> asyncio.AbstractEventLoop:
+    """Returns the shared event loop, starting its thread on first use."""
+    global _LOOP
+    with _LOOP_LOCK:
+        if _LOOP is None:
+            loop = asyncio.new_event_loop()
+            thread = threading.Thread(target=loop.run_forever, name="shared-event-loop", daemon=True)
+            thread.start()
+            _LOOP = loop
+        return _LOOP
+
+
+def run_async(coro: Coroutine, timeout: Optional[float] = None) -> Any:
+    """
+    Runs a coroutine on the shared loop and blocks the calling (request)
+    thread until it finishes, returning its result or raising its exception.
+    """
+    future = asyncio.run_coroutine_threadsafe(coro, get_shared_loop())
+    return future.result(timeout=timeout)
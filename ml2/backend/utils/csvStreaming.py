@@ -0,0 +1,95 @@
+# backend/utils/csvStreaming.py
+import os
+from pathlib import Path
+from typing import Iterator, Tuple
+
+import pandas as pd
+
+# --- Configuration (overridable through environment variables) ---
+STREAMING_COMPARE_CHUNK_ROWS = int(os.getenv("STREAMING_COMPARE_CHUNK_ROWS", "2000"))
+
+
+def count_csv_rows(path: Path) -> int:
+    """
+    Counts data rows with the same pandas reader the streaming comparison
+    uses, so blank lines and quoted newlines are counted the same way. Only
+    the first column is materialized, in chunks.
+    """
+    try:
+        chunks = pd.read_csv(path, usecols=[0], chunksize=STREAMING_COMPARE_CHUNK_ROWS * 10)
+        return sum(len(chunk) for chunk in chunks)
+    except pd.errors.EmptyDataError:
+        return 0
+
+
+def iter_csv_chunks(path: Path, chunk_rows: int = STREAMING_COMPARE_CHUNK_ROWS) -> Iterator[pd.DataFrame]:
+    """pandas chunk reader over a CSV; nothing at all for a completely empty file."""
+    try:
+        yield from pd.read_csv(path, chunksize=chunk_rows)
+    except pd.errors.EmptyDataError:
+        return
+
+
+def compare_csvs_streaming(student_path: Path, solution_path: Path, threshold: float = 0.8,
+                           chunk_rows: int = STREAMING_COMPARE_CHUNK_ROWS) -> Tuple[bool, float]:
+    """
+    Direct (cell-by-cell) comparison that reads both files in aligned chunks of
+    `chunk_rows` rows, so peak memory does not grow with file size.
+
+    The solution's row count is taken up front with the same reader, which
+    fixes the total number of cells; the student file is read once and must
+    have the same number of rows. Comparison stops as soon as the threshold
+    is either unreachable or already met. On an early fail the reported score
+    is the best score still possible; on an early pass it is the score
+    already guaranteed. An empty solution only matches an empty student file.
+    """
+    num_rows = count_csv_rows(solution_path)
+    student_chunks = iter_csv_chunks(student_path, chunk_rows)
+
+    def row_count_mismatch(student_rows: int) -> Tuple[bool, float]:
+        print(f"  - ERROR: Row counts do not match. Student: {student_rows}, Solution: {num_rows}")
+        return False, 0.0
+
+    matches, seen, seen_rows, total = 0, 0, 0, None
+    for chunk_solution in iter_csv_chunks(solution_path, chunk_rows):
+        chunk_student = next(student_chunks, None)
+        if chunk_student is None:
+            if not seen_rows:
+                print("  - ERROR: Student file is empty.")
+                return False, 0.0
+            return row_count_mismatch(seen_rows)
+        if chunk_student.shape != chunk_solution.shape:
+            if len(chunk_student) != len(chunk_solution):
+                return row_count_mismatch(seen_rows + len(chunk_student) + sum(len(chunk) for chunk in student_chunks))
+            print(f"  - ERROR: DataFrame shapes do not match. Student chunk: {chunk_student.shape}, Solution chunk: {chunk_solution.shape}")
+            return False, 0.0
+        if total is None:
+            total = num_rows * chunk_solution.shape[1]
+        seen_rows += len(chunk_solution)
+        if not total:
+            continue  # Header only: nothing to compare cell by cell.
+
+        matches += int((chunk_student.values == chunk_solution.values).sum())
+        seen += chunk_solution.size
+        remaining = total - seen
+
+        if (matches + remaining) / total < threshold:
+            best_possible = (matches + remaining) / total * 100
+            print(f"  - Early exit after {seen}/{total} cells: at most {best_possible:.2f}% similarity is reachable.")
+            return False, best_possible
+        if remaining > 0 and matches / total >= threshold:
+            # The rest of the student file is only counted, not compared.
+            student_rows = seen_rows + sum(len(chunk) for chunk in student_chunks)
+            if student_rows != num_rows:
+                return row_count_mismatch(student_rows)
+            guaranteed = matches / total * 100
+            print(f"  - Early exit after {seen}/{total} cells: at least {guaranteed:.2f}% similarity is guaranteed.")
+            return True, guaranteed
+
+    extra_rows = sum(len(chunk) for chunk in student_chunks)
+    if extra_rows:
+        return row_count_mismatch(seen_rows + extra_rows)
+
+    similarity_score = (matches / total) * 100 if total else 100.0
+    print(f"  - Overall Similarity: {similarity_score:.2f}%")
+    return similarity_score >= (threshold * 100), similarity_score
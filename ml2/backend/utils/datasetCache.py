@@ -0,0 +1,192 @@
+# backend/utils/datasetCache.py
+import os
+import json
+import fcntl
+import pickle
+import shutil
+import hashlib
+import threading
+from pathlib import Path
+from typing import Dict, Iterable, Optional
+
+import numpy as np
+import pandas as pd
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+DATASET_CACHE_PATH = BASE_DIR / "data" / "dataset_cache"
+KERNEL_HELPER_PATH = Path(__file__).resolve().parent / "kernelDatasets.py"
+
+# --- Configuration (overridable through environment variables) ---
+# Set DATASET_CACHE=0 to let every kernel parse datasets itself again.
+DATASET_CACHE_ENABLED = os.getenv("DATASET_CACHE", "1") == "1"
+
+# Readers whose results can be materialized, with the kind of cache they produce.
+CACHEABLE_READERS = {"pandas.read_csv": "table", "librosa.load": "audio"}
+
+# Sent to every kernel before use: installs utils/kernelDatasets.py as the
+# importable module `dataset_cache` without leaving names in the user namespace.
+KERNEL_BOOTSTRAP_TEMPLATE = """
+def _install_dataset_cache(source, manifest_path):
+    import sys, types
+    module = types.ModuleType("dataset_cache")
+    module.__file__ = "dataset_cache.py"
+    exec(compile(source, module.__file__, "exec"), module.__dict__)
+    sys.modules["dataset_cache"] = module
+    module.install(manifest_path)
+
+_install_dataset_cache({source!r}, {manifest!r})
+del _install_dataset_cache
+"""
+
+
+def _is_zero_copy_dtype(dtype) -> bool:
+    """Plain NumPy numeric/bool/datetime columns can be memory-mapped; everything else is pickled."""
+    return isinstance(dtype, np.dtype) and dtype.kind in "biufcmM"
+
+
+class DatasetCache:
+    """
+    Host-level, read-only copies of the datasets students load.
+
+    Every dataset declared in a warm-up profile (data/questions/<subject>/warmup.json)
+    with a cacheable reader is parsed once by the backend and written to
+    data/dataset_cache/<key>/:
+      pandas.read_csv  one .npy per numeric column plus table.pkl (column order, other columns)
+      librosa.load     samples.npy, with the sample rate in the manifest
+    manifest.json maps each source path (plus reader and arguments) to its
+    cache. Kernels map the .npy files copy-on-write, so 60 kernels share one
+    copy in the page cache instead of holding 60 parsed copies; a kernel that
+    writes to a column only copies the pages it touches.
+
+    Entries are rebuilt when the source file's mtime or size changes, and
+    kernels ignore an entry whose source no longer matches.
+    """
+
+    def __init__(self, cache_path: Path = DATASET_CACHE_PATH, enabled: bool = DATASET_CACHE_ENABLED):
+        self.cache_path = cache_path
+        self.manifest_path = cache_path / "manifest.json"
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self.built = 0
+        self.reused = 0
+        self.failures = 0
+
+    # --- Kernel side ---
+    def kernel_bootstrap_script(self) -> Optional[str]:
+        """Code that installs the dataset_cache helper and shims in a fresh kernel; None when disabled."""
+        if not self.enabled:
+            return None
+        return KERNEL_BOOTSTRAP_TEMPLATE.format(
+            source=KERNEL_HELPER_PATH.read_text(encoding="utf-8"), manifest=str(self.manifest_path)
+        )
+
+    # --- Materialization ---
+    def materialize(self, profiles: Iterable) -> None:
+        """
+        Builds (or reuses) the cache for every cacheable dataset in the given
+        warm-up profiles. Safe to run from several workers at once: builds are
+        serialized by a file lock and the manifest is replaced atomically.
+        """
+        if not self.enabled:
+            return
+        datasets = [
+            step for profile in profiles for step in profile.steps
+            if step["kind"] == "dataset" and step["reader"] in CACHEABLE_READERS
+        ]
+        if not datasets:
+            return
+        self.cache_path.mkdir(parents=True, exist_ok=True)
+        with self._lock, open(self.cache_path / ".lock", "w") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            entries = self._read_manifest()
+            for step in datasets:
+                source = os.path.realpath(step["path"])
+                try:
+                    entry = self._materialize_one(source, step["reader"], step["kwargs"], entries.get(source))
+                except Exception as e:
+                    print(f"[DATASETS] Could not cache {source} with {step['reader']}: {e}")
+                    self.failures += 1
+                    continue
+                old = entries.get(source)
+                entries[source] = entry
+                if old is not None and old["cache"] != entry["cache"]:
+                    # Kernels that still map the old files keep their mappings.
+                    shutil.rmtree(self.cache_path / old["cache"], ignore_errors=True)
+            self._write_manifest(entries)
+        print(f"[DATASETS] {len(datasets)} datasets cached in {self.cache_path} "
+              f"({self.built} built, {self.reused} reused, {self.failures} failed)")
+
+    def _materialize_one(self, source: str, reader: str, kwargs: Dict, current: Optional[Dict]) -> Dict:
+        stat = os.stat(source)
+        signature = json.dumps([source, reader, kwargs, stat.st_mtime_ns, stat.st_size], sort_keys=True)
+        key = hashlib.sha256(signature.encode("utf-8")).hexdigest()[:16]
+        if current is not None and current["cache"] == key and (self.cache_path / key).is_dir():
+            self.reused += 1
+            return current
+
+        tmp_dir = self.cache_path / f".{key}.{os.getpid()}.tmp"
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        tmp_dir.mkdir()
+        entry = {
+            "reader": reader,
+            "kwargs": kwargs,
+            "kind": CACHEABLE_READERS[reader],
+            "cache": key,
+            "source_mtime_ns": stat.st_mtime_ns,
+            "source_size": stat.st_size,
+        }
+        try:
+            if reader == "pandas.read_csv":
+                self._write_table(pd.read_csv(source, **kwargs), tmp_dir)
+            else:
+                import librosa
+                samples, sample_rate = librosa.load(source, **kwargs)
+                np.save(tmp_dir / "samples.npy", np.ascontiguousarray(samples))
+                entry["sr"] = sample_rate
+            shutil.rmtree(self.cache_path / key, ignore_errors=True)
+            os.replace(tmp_dir, self.cache_path / key)
+        finally:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+        self.built += 1
+        return entry
+
+    @staticmethod
+    def _write_table(df: pd.DataFrame, target: Path) -> None:
+        objects = {}
+        for position, (_name, column) in enumerate(df.items()):
+            if _is_zero_copy_dtype(column.dtype):
+                np.save(target / f"{position}.npy", np.ascontiguousarray(column.to_numpy()))
+            else:
+                objects[position] = column.reset_index(drop=True)
+        with open(target / "table.pkl", "wb") as f:
+            pickle.dump({"columns": list(df.columns), "objects": objects}, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+    def _read_manifest(self) -> Dict[str, Dict]:
+        try:
+            with open(self.manifest_path, "r", encoding="utf-8") as f:
+                return json.load(f).get("entries", {})
+        except (FileNotFoundError, ValueError):
+            return {}
+
+    def _write_manifest(self, entries: Dict[str, Dict]) -> None:
+        tmp_path = self.manifest_path.with_name(f".{self.manifest_path.name}.{os.getpid()}.tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"entries": entries}, f, indent=2)
+        os.replace(tmp_path, self.manifest_path)
+
+    def stats(self) -> Dict:
+        entries = self._read_manifest()
+        size = sum(
+            path.stat().st_size
+            for entry in entries.values()
+            for path in (self.cache_path / entry["cache"]).glob("*")
+            if path.is_file()
+        )
+        return {
+            "enabled": self.enabled,
+            "datasets": len(entries),
+            "size_mb": round(size / (1024 * 1024), 1),
+            "built": self.built,
+            "reused": self.reused,
+            "failures": self.failures,
+        }
@@ -0,0 +1,215 @@
+# backend/utils/forkServer.py
+"""
+Lightweight executor for stateless stdin/stdout test cases.
+
+A long-lived server process pre-imports the heavy libraries once and then, for
+every test case, forks a child that runs the student code with the test input
+piped into its real stdin. Children start in milliseconds because they share
+the already-imported modules with the server. Each child gets a wall-clock
+limit (SIGALRM, plus SIGKILL from the client as a backstop) and an
+address-space limit (RLIMIT_AS).
+
+Protocol over a Unix socket, one connection per test case:
+  client -> {"code", "stdin", "timeout", "memory_mb"}\\n
+  child  -> {"pid"}\\n  then  {"stdout", "stderr"}\\n
+"""
+import os
+import sys
+import atexit
+import json
+import signal
+import socket
+import asyncio
+import time
+import tempfile
+import threading
+import subprocess
+from pathlib import Path
+from typing import Optional, Tuple
+
+# --- Configuration (overridable through environment variables) ---
+FORK_SERVER_TIMEOUT = int(os.getenv("FORK_SERVER_TIMEOUT", "10"))  # seconds per test case
+FORK_SERVER_MEMORY_MB = int(os.getenv("FORK_SERVER_MEMORY_MB", "512"))  # on top of the preloaded server
+FORK_SERVER_PRELOAD = os.getenv("FORK_SERVER_PRELOAD", "numpy,pandas")
+MAX_OUTPUT_BYTES = 1024 * 1024
+KILL_GRACE_SECONDS = 2
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+
+
+# --- Server side (runs in its own process) ---
+
+class _WallClockExceeded(BaseException):
+    """Raised inside a child when its wall-clock limit expires."""
+
+
+def _current_address_space() -> int:
+    with open("/proc/self/statm") as f:
+        return int(f.read().split()[0]) * os.sysconf("SC_PAGE_SIZE")
+
+
+def _run_child(conn: socket.socket, request: dict) -> None:
+    """Runs one test case inside a freshly forked child. Never returns."""
+    import io
+    import ast
+    import resource
+    import traceback
+
+    signal.signal(signal.SIGCHLD, signal.SIG_DFL)
+    conn.sendall((json.dumps({"pid": os.getpid()}) + "\n").encode())
+
+    memory_limit = _current_address_space() + int(request.get("memory_mb", FORK_SERVER_MEMORY_MB)) * 1024 * 1024
+    resource.setrlimit(resource.RLIMIT_AS, (memory_limit, memory_limit))
+
+    # Real stdin: a pipe pre-filled with the test input.
+    stdin_data = request.get("stdin", "")
+    if stdin_data and not stdin_data.endswith("\n"):
+        stdin_data += "\n"
+    read_fd, write_fd = os.pipe()
+    os.write(write_fd, stdin_data.encode())
+    os.close(write_fd)
+    os.dup2(read_fd, 0)
+    os.close(read_fd)
+    sys.stdin = io.TextIOWrapper(os.fdopen(0, "rb", closefd=False))
+
+    out_file, err_file = tempfile.TemporaryFile(), tempfile.TemporaryFile()
+    os.dup2(out_file.fileno(), 1)
+    os.dup2(err_file.fileno(), 2)
+    sys.stdout = io.TextIOWrapper(os.fdopen(1, "wb", closefd=False), write_through=True)
+    sys.stderr = io.TextIOWrapper(os.fdopen(2, "wb", closefd=False), write_through=True)
+
+    def on_alarm(signum, frame):
+        raise _WallClockExceeded()
+
+    timeout = int(request.get("timeout", FORK_SERVER_TIMEOUT))
+    signal.signal(signal.SIGALRM, on_alarm)
+    signal.alarm(timeout)
+    try:
+        # Match a notebook cell: echo the value of a trailing expression.
+        tree = ast.parse(request["code"], "<student_code>")
+        tail = None
+        if tree.body and isinstance(tree.body[-1], ast.Expr):
+            tail = compile(ast.Expression(tree.body.pop().value), "<student_code>", "eval")
+        namespace = {"__name__": "__main__"}
+        exec(compile(tree, "<student_code>", "exec"), namespace)
+        if tail is not None:
+            value = eval(tail, namespace)
+            if value is not None: print(repr(value))
+    except _WallClockExceeded:
+        print(f"\n[Execution Timeout] Execution exceeded {timeout} seconds.", file=sys.stderr)
+    except MemoryError:
+        print(f"\n[Memory Limit] Execution exceeded {request.get('memory_mb', FORK_SERVER_MEMORY_MB)} MB.", file=sys.stderr)
+    except (Exception, SystemExit):
+        traceback.print_exc()
+    finally:
+        signal.alarm(0)
+
+    try:
+        sys.stdout.flush()
+        sys.stderr.flush()
+        result = {}
+        for name, f in (("stdout", out_file), ("stderr", err_file)):
+            f.seek(0)
+            result[name] = f.read(MAX_OUTPUT_BYTES).decode("utf-8", errors="replace")
+        conn.sendall((json.dumps(result) + "\n").encode())
+    finally:
+        os._exit(0)
+
+
+def serve(socket_path: str) -> None:
+    """Fork-server main loop: preload modules, then fork one child per request."""
+    for module_name in filter(None, (m.strip() for m in FORK_SERVER_PRELOAD.split(","))):
+        try:
+            __import__(module_name)
+        except ImportError as e:
+            print(f"[FORK SERVER] Could not preload {module_name}: {e}")
+
+    # Children are reaped automatically; the client learns their fate over the socket.
+    signal.signal(signal.SIGCHLD, signal.SIG_IGN)
+
+    if os.path.exists(socket_path):
+        os.unlink(socket_path)
+    listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    listener.bind(socket_path)
+    listener.listen(128)
+    print(f"[FORK SERVER] Listening on {socket_path} (pid {os.getpid()})")
+
+    while True:
+        conn, _addr = listener.accept()
+        try:
+            request = json.loads(conn.makefile("rb").readline())
+        except (ValueError, OSError):
+            conn.close()
+            continue
+        if os.fork() == 0:
+            listener.close()
+            _run_child(conn, request)
+        conn.close()
+
+
+# --- Client side (runs in the web server process) ---
+
+class ForkServerClient:
+    """Starts the fork-server on first use and submits test cases to it."""
+
+    def __init__(self):
+        self.socket_path = os.path.join(tempfile.gettempdir(), f"ps-ml-forkserver-{os.getpid()}.sock")
+        self._process: Optional[subprocess.Popen] = None
+        self._lock = threading.Lock()
+        atexit.register(self.shutdown)
+
+    def ensure_started(self) -> None:
+        with self._lock:
+            if self._process is not None and self._process.poll() is None:
+                return
+            if os.path.exists(self.socket_path):
+                os.unlink(self.socket_path)
+            self._process = subprocess.Popen(
+                [sys.executable, "-m", "utils.forkServer", self.socket_path],
+                cwd=BASE_DIR,
+            )
+            # Wait (holding the lock) for the socket so no request races the preload.
+            for _ in range(600):
+                if os.path.exists(self.socket_path):
+                    return
+                if self._process.poll() is not None:
+                    break
+                time.sleep(0.05)
+            raise RuntimeError("Fork server failed to start.")
+
+    def shutdown(self) -> None:
+        with self._lock:
+            if self._process is not None and self._process.poll() is None:
+                self._process.terminate()
+            self._process = None
+
+    async def run(self, code: str, stdin: str = "", timeout: int = FORK_SERVER_TIMEOUT,
+                  memory_mb: int = FORK_SERVER_MEMORY_MB) -> Tuple[str, str]:
+        """Runs one test case in a forked child and returns (stdout, stderr), stripped."""
+        await asyncio.to_thread(self.ensure_started)
+        reader, writer = await asyncio.open_unix_connection(self.socket_path, limit=4 * MAX_OUTPUT_BYTES)
+        pid = None
+        try:
+            request = {"code": code, "stdin": stdin, "timeout": timeout, "memory_mb": memory_mb}
+            writer.write((json.dumps(request) + "\n").encode())
+            await writer.drain()
+            pid = json.loads(await reader.readline())["pid"]
+            line = await asyncio.wait_for(reader.readline(), timeout=timeout + KILL_GRACE_SECONDS)
+            if not line:
+                return "", "[Execution Error] Process was terminated (possibly exceeded its memory limit)."
+            result = json.loads(line)
+            pid = None
+            return result["stdout"].strip(), result["stderr"].strip()
+        except asyncio.TimeoutError:
+            return "", f"[Execution Timeout] Execution exceeded {timeout} seconds."
+        except (ValueError, KeyError):
+            return "", "[Execution Error] Fork server returned a malformed response."
+        finally:
+            if pid is not None:
+                try: os.kill(pid, signal.SIGKILL)
+                except ProcessLookupError: pass
+            writer.close()
+
+
+if __name__ == "__main__":
+    serve(sys.argv[1])
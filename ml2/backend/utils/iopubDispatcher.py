@@ -0,0 +1,95 @@
+# backend/utils/iopubDispatcher.py
+import asyncio
+import queue
+import threading
+from typing import Dict, Tuple
+
+from jupyter_client.manager import KernelClient
+
+IOPUB_POLL_TIMEOUT = 1  # seconds; how often the reader re-checks for shutdown
+
+
+class IopubDispatcher:
+    """
+    Owns the iopub channel of one kernel client. A single long-lived reader
+    thread pulls every message off iopub and hands it to the asyncio.Queue
+    registered for the message's parent msg_id. That lets several executions
+    on the same kernel be in flight at once without losing each other's output.
+    """
+
+    def __init__(self, kc: KernelClient):
+        self.kc = kc
+        self._routes: Dict[str, Tuple[asyncio.AbstractEventLoop, asyncio.Queue]] = {}
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._reader = threading.Thread(target=self._read_loop, name="iopub-dispatcher", daemon=True)
+        self._reader.start()
+
+    def execute(self, code: str) -> Tuple[str, asyncio.Queue]:
+        """
+        Sends an execute_request and returns (msg_id, queue) where the queue
+        receives every iopub message produced by that execution. Must be
+        called from inside a running event loop.
+        """
+        loop = asyncio.get_running_loop()
+        messages: asyncio.Queue = asyncio.Queue()
+        # Holding the lock across send + register means the reader can't route
+        # (and drop) a reply before its queue exists.
+        with self._lock:
+            msg_id = self.kc.execute(code)
+            self._routes[msg_id] = (loop, messages)
+        return msg_id, messages
+
+    def release(self, msg_id: str) -> None:
+        """Stops routing messages for a finished execution."""
+        with self._lock:
+            self._routes.pop(msg_id, None)
+
+    def stop(self) -> None:
+        self._stopped.set()
+
+    def _read_loop(self) -> None:
+        while not self._stopped.is_set():
+            try:
+                msg = self.kc.get_iopub_msg(timeout=IOPUB_POLL_TIMEOUT)
+            except queue.Empty:
+                continue
+            except Exception:
+                # Channels were closed underneath us; the kernel is going away.
+                if not self.kc.is_alive():
+                    break
+                continue
+
+            parent_id = msg.get('parent_header', {}).get('msg_id')
+            with self._lock:
+                route = self._routes.get(parent_id)
+            if route is None:
+                continue  # Output of an execution nobody is waiting on any more.
+            loop, messages = route
+            try:
+                loop.call_soon_threadsafe(messages.put_nowait, msg)
+            except RuntimeError:
+                # The waiting event loop has already been closed.
+                self.release(parent_id)
+
+
+# --- One dispatcher per kernel client ---
+_DISPATCHERS: Dict[int, IopubDispatcher] = {}
+_DISPATCHERS_LOCK = threading.Lock()
+
+
+def get_iopub_dispatcher(kc: KernelClient) -> IopubDispatcher:
+    """Returns the dispatcher for a kernel client, starting it on first use."""
+    with _DISPATCHERS_LOCK:
+        dispatcher = _DISPATCHERS.get(id(kc))
+        if dispatcher is None:
+            dispatcher = IopubDispatcher(kc)
+            _DISPATCHERS[id(kc)] = dispatcher
+        return dispatcher
+
+
+def stop_iopub_dispatcher(kc: KernelClient) -> None:
+    with _DISPATCHERS_LOCK:
+        dispatcher = _DISPATCHERS.pop(id(kc), None)
+    if dispatcher is not None:
+        dispatcher.stop()
@@ -0,0 +1,159 @@
+# backend/utils/kernelDatasets.py
+# Runs INSIDE student kernels, not in the backend: utils/datasetCache.py sends
+# this source to every kernel as the module `dataset_cache`. Standard library
+# only at import time; numpy/pandas are imported when a dataset is loaded.
+#
+#   import dataset_cache
+#   df = dataset_cache.load_table("/.../house-prices/train.csv")
+#   y, sr = dataset_cache.load_audio("/.../Audio50 (1).wav", sr=16000)
+#
+# Existing code needs no change: pandas.read_csv(path) and librosa.load(path, ...)
+# are wrapped as soon as pandas/librosa are imported and return the cached
+# copy when the call matches a materialized dataset, else fall through.
+import os
+import sys
+import json
+import pickle
+import functools
+import importlib.abc
+
+_manifest_path = None
+_manifest = {}
+_manifest_mtime = None
+_stats = {"hits": 0, "misses": 0}
+
+
+def _entries():
+    """Manifest entries keyed by source path, re-read when the backend rewrites it."""
+    global _manifest, _manifest_mtime
+    try:
+        mtime = os.stat(_manifest_path).st_mtime_ns
+    except (OSError, TypeError):
+        return {}
+    if mtime != _manifest_mtime:
+        with open(_manifest_path, "r", encoding="utf-8") as f:
+            _manifest = json.load(f).get("entries", {})
+        _manifest_mtime = mtime
+    return _manifest
+
+
+def _lookup(path, reader, kwargs):
+    """The manifest entry for this exact call, if its source file is unchanged."""
+    try:
+        source = os.path.realpath(os.fspath(path))
+    except TypeError:
+        return None  # file objects, buffers, URLs as non-path types
+    entry = _entries().get(source)
+    if entry is None or entry["reader"] != reader or entry["kwargs"] != kwargs:
+        return None
+    try:
+        stat = os.stat(source)
+    except OSError:
+        return None
+    if stat.st_mtime_ns != entry["source_mtime_ns"] or stat.st_size != entry["source_size"]:
+        return None
+    return entry
+
+
+def _map(path):
+    """Copy-on-write memory map: pages are shared with every kernel until written."""
+    import numpy as np
+    return np.load(path, mmap_mode="c").view(np.ndarray)
+
+
+def load_table(path, **kwargs):
+    """DataFrame for a materialized pandas.read_csv dataset (numeric columns zero-copy), else None."""
+    entry = _lookup(path, "pandas.read_csv", kwargs)
+    if entry is None:
+        return None
+    import pandas as pd
+    cache_dir = os.path.join(os.path.dirname(_manifest_path), entry["cache"])
+    with open(os.path.join(cache_dir, "table.pkl"), "rb") as f:
+        table = pickle.load(f)
+    columns = {}
+    for position, name in enumerate(table["columns"]):
+        if position in table["objects"]:
+            columns[name] = table["objects"][position]
+        else:
+            columns[name] = _map(os.path.join(cache_dir, f"{position}.npy"))
+    return pd.DataFrame(columns, copy=False)
+
+
+def load_audio(path, **kwargs):
+    """(samples, sample_rate) for a materialized librosa.load dataset (zero-copy), else None."""
+    entry = _lookup(path, "librosa.load", kwargs)
+    if entry is None:
+        return None
+    cache_dir = os.path.join(os.path.dirname(_manifest_path), entry["cache"])
+    return _map(os.path.join(cache_dir, "samples.npy")), entry["sr"]
+
+
+def stats():
+    return dict(_stats, datasets=len(_entries()))
+
+
+def _cached(loader, original):
+    @functools.wraps(original)
+    def wrapper(path, *args, **kwargs):
+        result = None
+        if not args:
+            try:
+                result = loader(path, **kwargs)
+            except Exception:
+                result = None  # a broken cache entry must never break the student's call
+        if result is None:
+            _stats["misses"] += 1
+            return original(path, *args, **kwargs)
+        _stats["hits"] += 1
+        return result
+    wrapper.__wrapped_by_dataset_cache__ = True
+    return wrapper
+
+
+def _patch_pandas(module):
+    if not getattr(module.read_csv, "__wrapped_by_dataset_cache__", False):
+        module.read_csv = _cached(load_table, module.read_csv)
+
+
+def _patch_librosa(module):
+    if not getattr(module.load, "__wrapped_by_dataset_cache__", False):
+        module.load = _cached(load_audio, module.load)
+
+
+_PATCHES = {"pandas": _patch_pandas, "librosa": _patch_librosa}
+
+
+class _PatchOnImport(importlib.abc.MetaPathFinder):
+    """Applies the wrappers right after pandas/librosa are first imported, so kernels don't pay for imports they never use."""
+
+    def find_spec(self, name, path, target=None):
+        if name not in _PATCHES:
+            return None
+        for finder in sys.meta_path:
+            if finder is self or not hasattr(finder, "find_spec"):
+                continue
+            spec = finder.find_spec(name, path, target)
+            if spec is not None:
+                break
+        else:
+            return None
+        if spec.loader is None or not hasattr(spec.loader, "exec_module"):
+            return spec
+        exec_module = spec.loader.exec_module
+
+        def exec_and_patch(module):
+            exec_module(module)
+            _PATCHES[name](module)
+
+        spec.loader.exec_module = exec_and_patch
+        return spec
+
+
+def install(manifest_path):
+    global _manifest_path
+    _manifest_path = manifest_path
+    for name, patch in _PATCHES.items():
+        if name in sys.modules:
+            patch(sys.modules[name])
+    if not any(isinstance(finder, _PatchOnImport) for finder in sys.meta_path):
+        sys.meta_path.insert(0, _PatchOnImport())
@@ -0,0 +1,272 @@
+# backend/utils/kernelPool.py
+import os
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Deque, Dict, List, Optional, Tuple
+
+from jupyter_client.manager import KernelManager, KernelClient
+from utils.iopubDispatcher import stop_iopub_dispatcher
+from utils.warmupProfiles import WarmupProfile, run_warmup
+
+# --- Configuration (overridable through environment variables) ---
+KERNEL_POOL_SIZE = int(os.getenv("KERNEL_POOL_SIZE", "8"))
+KERNEL_POOL_REFILL_CONCURRENCY = int(os.getenv("KERNEL_POOL_REFILL_CONCURRENCY", "2"))
+KERNEL_READY_TIMEOUT = int(os.getenv("KERNEL_READY_TIMEOUT", "30"))
+# Share of the pool always kept generic, whatever the warm-up profiles ask for.
+KERNEL_POOL_GENERIC_SHARE = float(os.getenv("KERNEL_POOL_GENERIC_SHARE", "0.5"))
+REFILL_CHECK_INTERVAL = 5  # seconds between refiller wake-ups when idle
+
+
+def start_kernel(ready_timeout: int = KERNEL_READY_TIMEOUT, bootstrap: Optional[str] = None) -> Tuple[KernelManager, KernelClient]:
+    """
+    Starts a new Jupyter kernel and blocks until it is ready to execute code,
+    then runs the optional bootstrap code in it. Raises RuntimeError if the
+    kernel does not become ready (or bootstrapped) in time.
+    """
+    km = KernelManager()
+    km.start_kernel()
+    kc = km.client()
+    kc.start_channels()
+    try:
+        kc.wait_for_ready(timeout=ready_timeout)
+        if bootstrap:
+            kc.execute_interactive(bootstrap, store_history=False, timeout=ready_timeout, output_hook=lambda msg: None)
+    except (RuntimeError, TimeoutError) as e:
+        shutdown_kernel(km, kc)
+        raise RuntimeError(f"Kernel not ready: {e}") from e
+    return km, kc
+
+
+def release_kernel_client(kc: KernelClient) -> None:
+    """Stops a client's iopub dispatcher and channels; the kernel itself keeps running."""
+    stop_iopub_dispatcher(kc)
+    if kc.is_alive(): kc.stop_channels()
+
+
+def shutdown_kernel(km: Optional[KernelManager], kc: KernelClient) -> None:
+    """
+    Releases the client and shuts the kernel process down. Without a
+    KernelManager (a client attached to another worker's kernel) the kernel
+    is asked to exit through a shutdown request instead.
+    """
+    try:
+        if km is None: kc.shutdown()
+        release_kernel_client(kc)
+    finally:
+        if km is not None and km.is_alive(): km.shutdown_kernel(now=True)
+
+
+class KernelPool:
+    """
+    Keeps a number of started, ready-to-use kernels around so that handing one
+    to a student is a simple pop instead of a multi-second kernel start.
+    A background refiller thread tops the pool back up to its target size,
+    starting at most `refill_concurrency` kernels at the same time.
+
+    With warm-up profiles, part of the pool is kept per subject: those kernels
+    have already run the subject's warm-up (imports, dataset reads) before
+    they are handed out. A generic share of `size` is reserved first (at
+    least one kernel); the profiles split the rest, scaled down
+    proportionally when they ask for more than fits.
+
+    `bootstrap` is code run in every kernel right after it starts, pooled or
+    not (e.g. installing the dataset cache shims).
+    """
+
+    def __init__(self, size: int = KERNEL_POOL_SIZE, refill_concurrency: int = KERNEL_POOL_REFILL_CONCURRENCY,
+                 profiles: Optional[Dict[str, WarmupProfile]] = None, bootstrap: Optional[str] = None):
+        self.size = size
+        self.refill_concurrency = max(1, refill_concurrency)
+        self.profiles = profiles or {}
+        self.bootstrap = bootstrap
+        self._targets = self._split_targets()
+        # Ready kernels per bucket: None is the generic pool, otherwise a profile name.
+        self._ready: Dict[Optional[str], Deque[Tuple[KernelManager, KernelClient]]] = {
+            bucket: deque() for bucket in self._targets
+        }
+        self._starting: Dict[Optional[str], int] = {bucket: 0 for bucket in self._targets}
+        self._warmup_stats: Dict[str, Dict] = {
+            name: {"runs": 0, "failures": 0, "hits": 0, "misses": 0, "total_ms": 0.0, "last": None}
+            for name in self.profiles
+        }
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stopped = threading.Event()
+        self._executor = ThreadPoolExecutor(max_workers=self.refill_concurrency, thread_name_prefix="kernel-refill")
+        self._refiller = None
+        self.hits = 0
+        self.misses = 0
+        self.failures = 0
+
+    # --- Lifecycle ---
+    def start(self) -> None:
+        """Starts the background refiller. Safe to call more than once."""
+        with self._lock:
+            if self._refiller is not None or self.size <= 0:
+                return
+            self._refiller = threading.Thread(target=self._refill_loop, name="kernel-pool-refiller", daemon=True)
+            self._refiller.start()
+        warm = ", ".join(f"{name}={target}" for name, target in self._targets.items() if name is not None)
+        print(f"[POOL] Kernel pool started (size={self.size}, refill_concurrency={self.refill_concurrency}"
+              f"{f', warm: {warm}' if warm else ''})")
+
+    def shutdown(self) -> None:
+        """Stops the refiller and shuts down every kernel still waiting in the pool."""
+        self._stopped.set()
+        self._wakeup.set()
+        self._executor.shutdown(wait=False)
+        with self._lock:
+            kernels = [kernel for ready in self._ready.values() for kernel in ready]
+            for ready in self._ready.values():
+                ready.clear()
+        for km, kc in kernels:
+            shutdown_kernel(km, kc)
+
+    # --- Public API ---
+    def acquire(self, profile: Optional[str] = None) -> Tuple[KernelManager, KernelClient]:
+        """
+        Returns a ready kernel. With a profile (a subject) a kernel already
+        warmed for it is preferred; otherwise, or if none is ready, a generic
+        one is taken from the pool (hit). Without any ready kernel one is
+        started synchronously (miss). Raises RuntimeError if a kernel cannot
+        be started in time.
+        """
+        self.start()
+        if profile in self.profiles:
+            kernel = self._pop_alive(profile)
+            with self._lock:
+                self._warmup_stats[profile]["hits" if kernel else "misses"] += 1
+            if kernel is not None:
+                return kernel
+
+        kernel = self._pop_alive(None)
+        if kernel is not None:
+            return kernel
+
+        with self._lock:
+            self.misses += 1
+        self._wakeup.set()
+        return start_kernel(bootstrap=self.bootstrap)
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                "target_size": self.size,
+                "ready": sum(len(ready) for ready in self._ready.values()),
+                "starting": sum(self._starting.values()),
+                "refill_concurrency": self.refill_concurrency,
+                "hits": self.hits,
+                "misses": self.misses,
+                "failures": self.failures,
+                "warmup": {name: self._warmup_report(name) for name in self.profiles},
+            }
+
+    def _warmup_report(self, name: str) -> Dict:
+        stats = self._warmup_stats[name]
+        return {
+            "target": self._targets.get(name, 0),
+            "ready": len(self._ready.get(name, ())),
+            "hits": stats["hits"],
+            "misses": stats["misses"],
+            "runs": stats["runs"],
+            "failures": stats["failures"],
+            "avg_ms": round(stats["total_ms"] / stats["runs"], 1) if stats["runs"] else None,
+            "last": stats["last"],
+        }
+
+    def _split_targets(self) -> Dict[Optional[str], int]:
+        """Per-bucket pool sizes: the generic floor first, then the profiles' pool_size scaled to what is left."""
+        size = max(0, self.size)
+        generic = min(size, max(1, int(size * KERNEL_POOL_GENERIC_SHARE + 0.5)))
+        available = size - generic
+        requested = {name: max(0, profile.pool_size) for name, profile in self.profiles.items()}
+        total = sum(requested.values())
+        if total <= available:
+            targets: Dict[Optional[str], int] = dict(requested)
+        else:
+            # Proportional shares, rounded down; the kernels lost to rounding go
+            # to the profiles with the largest remainders.
+            shares = {name: want * available / total for name, want in requested.items()}
+            targets = {name: int(share) for name, share in shares.items()}
+            leftover = available - sum(targets.values())
+            for name in sorted(shares, key=lambda name: shares[name] - targets[name], reverse=True)[:leftover]:
+                targets[name] += 1
+        targets[None] = size - sum(targets.values())
+        return targets
+
+    def _pop_alive(self, bucket: Optional[str]) -> Optional[Tuple[KernelManager, KernelClient]]:
+        while True:
+            with self._lock:
+                ready = self._ready[bucket]
+                kernel = ready.popleft() if ready else None
+            if kernel is None:
+                return None
+            km, kc = kernel
+            if km.is_alive():
+                with self._lock:
+                    self.hits += 1
+                self._wakeup.set()
+                return km, kc
+            # A pooled kernel died while waiting; discard it and try the next one.
+            shutdown_kernel(km, kc)
+
+    # --- Background refill ---
+    def _refill_loop(self) -> None:
+        while not self._stopped.is_set():
+            to_start: List[Optional[str]] = []
+            with self._lock:
+                in_flight = sum(self._starting.values())
+                for bucket, target in self._targets.items():
+                    deficit = target - len(self._ready[bucket]) - self._starting[bucket]
+                    count = max(0, min(deficit, self.refill_concurrency - in_flight - len(to_start)))
+                    self._starting[bucket] += count
+                    to_start.extend([bucket] * count)
+            for bucket in to_start:
+                self._executor.submit(self._refill_one, bucket)
+            self._wakeup.wait(timeout=REFILL_CHECK_INTERVAL)
+            self._wakeup.clear()
+
+    def _refill_one(self, bucket: Optional[str] = None) -> None:
+        try:
+            km, kc = start_kernel(bootstrap=self.bootstrap)
+        except Exception as e:
+            print(f"[POOL] Failed to start pooled kernel: {e}")
+            with self._lock:
+                self._starting[bucket] -= 1
+                self.failures += 1
+            return
+
+        if bucket is not None:
+            self._warm(bucket, kc)
+
+        with self._lock:
+            self._starting[bucket] -= 1
+            if not self._stopped.is_set():
+                self._ready[bucket].append((km, kc))
+                km, kc = None, None
+        if km is not None:
+            shutdown_kernel(km, kc)
+        self._wakeup.set()
+
+    def _warm(self, name: str, kc: KernelClient) -> None:
+        """Runs the profile's warm-up and records its cost; a failed warm-up still leaves a usable kernel."""
+        try:
+            result = run_warmup(kc, self.profiles[name])
+        except Exception as e:
+            print(f"[WARMUP] {name}: warm-up failed: {e}")
+            with self._lock:
+                self._warmup_stats[name]["failures"] += 1
+            return
+
+        failed = [step for step in result["steps"] if "error" in step]
+        with self._lock:
+            stats = self._warmup_stats[name]
+            stats["runs"] += 1
+            stats["failures"] += 1 if failed else 0
+            stats["total_ms"] += result["ms"]
+            stats["last"] = result
+        breakdown = ", ".join(f"{step['step']} {step['ms']:.0f}ms" for step in result["steps"])
+        print(f"[WARMUP] {name}: {result['ms']:.0f}ms ({breakdown})")
+        for step in failed:
+            print(f"[WARMUP] {name}: {step['step']} failed: {step['error']}")
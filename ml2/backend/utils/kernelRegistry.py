@@ -0,0 +1,220 @@
+# backend/utils/kernelRegistry.py
+import os
+import json
+import time
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from utils.sqliteDb import SqliteDb
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+KERNEL_REGISTRY_DB_PATH = BASE_DIR / "data" / "kernels.db"
+
+# --- Configuration (overridable through environment variables) ---
+# How long expired session ids are remembered (so /run can answer 410 instead of 404).
+EXPIRED_SESSION_RETENTION = int(os.getenv("EXPIRED_SESSION_RETENTION", "86400"))  # seconds
+# Per-execution resource usage not claimed by a submission is dropped after this long.
+EXECUTION_USAGE_RETENTION = int(os.getenv("EXECUTION_USAGE_RETENTION", "86400"))  # seconds
+
+
+def pid_alive(pid: Optional[int]) -> bool:
+    if not pid:
+        return False
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def process_start_time(pid: Optional[int]) -> Optional[int]:
+    """Start time of a process in clock ticks since boot (/proc/<pid>/stat field 22), None if unknown."""
+    if not pid:
+        return None
+    try:
+        with open(f"/proc/{pid}/stat", "r") as f:
+            # The command name may contain spaces; the numeric fields start after its closing paren.
+            return int(f.read().rsplit(")", 1)[1].split()[19])
+    except (OSError, IndexError, ValueError):
+        return None
+
+
+def kernel_alive(entry: Dict) -> bool:
+    """
+    Whether a registry row's kernel process still runs. The pid alone is not
+    enough once it may have been reused: the process must also have the start
+    time recorded when the kernel was registered.
+    """
+    if not pid_alive(entry["kernel_pid"]):
+        return False
+    started = entry.get("kernel_started")
+    return started is None or process_start_time(entry["kernel_pid"]) == started
+
+
+def serializable_connection_info(info: Dict) -> Dict:
+    """Connection info from KernelManager.get_connection_info() with the HMAC key as text."""
+    return {k: (v.decode("utf-8") if isinstance(v, bytes) else v) for k, v in info.items()}
+
+
+class SharedKernelRegistry:
+    """
+    Session -> kernel map shared by every worker process on this host.
+
+    Each row holds the kernel's connection info (what a connection file
+    contains), the kernel's pid and process start time, the pid of the worker that started it (the
+    owner) and the last time any worker used the session. Any worker can
+    attach a client to a session's kernel from this row; only the owner can
+    shut it down through its KernelManager.
+    """
+
+    SCHEMA = """
+    CREATE TABLE IF NOT EXISTS kernel_sessions (
+        session_id      TEXT PRIMARY KEY,
+        connection_info TEXT NOT NULL,
+        kernel_pid      INTEGER,
+        kernel_started  INTEGER,
+        owner_pid       INTEGER NOT NULL,
+        last_activity   REAL NOT NULL
+    );
+    CREATE INDEX IF NOT EXISTS kernel_sessions_by_owner ON kernel_sessions (owner_pid);
+    CREATE TABLE IF NOT EXISTS expired_sessions (
+        session_id TEXT PRIMARY KEY,
+        reason     TEXT NOT NULL,
+        expired_at REAL NOT NULL
+    );
+    CREATE TABLE IF NOT EXISTS execution_usage (
+        id                INTEGER PRIMARY KEY AUTOINCREMENT,
+        session_id        TEXT NOT NULL,
+        question_id       TEXT,
+        part_id           TEXT,
+        kind              TEXT NOT NULL,
+        executions        INTEGER NOT NULL,
+        wall_ms           REAL,
+        cpu_ms            REAL,
+        peak_rss_delta_kb INTEGER,
+        recorded_at       REAL NOT NULL
+    );
+    CREATE INDEX IF NOT EXISTS execution_usage_by_session ON execution_usage (session_id);
+    """
+
+    def __init__(self, db_path: Path = KERNEL_REGISTRY_DB_PATH):
+        self.db = SqliteDb(db_path, self.SCHEMA)
+        # Columns added after the first release; older registries get them here.
+        for table, column, column_type in (("kernel_sessions", "kernel_started", "INTEGER"),
+                                           ("execution_usage", "part_id", "TEXT")):
+            columns = {row["name"] for row in self.db.connection().execute(f"PRAGMA table_info({table})")}
+            if column not in columns:
+                self.db.connection().execute(f"ALTER TABLE {table} ADD COLUMN {column} {column_type}")
+
+    def register(self, session_id: str, connection_info: Dict, kernel_pid: Optional[int]) -> None:
+        with self.db.transaction() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO kernel_sessions (session_id, connection_info, kernel_pid, kernel_started, "
+                "owner_pid, last_activity) VALUES (?, ?, ?, ?, ?, ?)",
+                (session_id, json.dumps(serializable_connection_info(connection_info)), kernel_pid,
+                 process_start_time(kernel_pid), os.getpid(), time.time()),
+            )
+            conn.execute("DELETE FROM expired_sessions WHERE session_id = ?", (session_id,))
+
+    def lookup(self, session_id: str) -> Optional[Dict]:
+        row = self.db.connection().execute(
+            "SELECT * FROM kernel_sessions WHERE session_id = ?", (session_id,)
+        ).fetchone()
+        if row is None:
+            return None
+        entry = dict(row)
+        entry["connection_info"] = json.loads(entry["connection_info"])
+        return entry
+
+    def touch(self, session_id: str) -> None:
+        with self.db.transaction() as conn:
+            conn.execute(
+                "UPDATE kernel_sessions SET last_activity = ? WHERE session_id = ?", (time.time(), session_id)
+            )
+
+    def last_activity(self, session_ids: Iterable[str]) -> Dict[str, float]:
+        """Wall-clock last activity of the given sessions; missing sessions are left out."""
+        session_ids = list(session_ids)
+        if not session_ids:
+            return {}
+        placeholders = ",".join("?" * len(session_ids))
+        rows = self.db.connection().execute(
+            f"SELECT session_id, last_activity FROM kernel_sessions WHERE session_id IN ({placeholders})", session_ids
+        )
+        return {row["session_id"]: row["last_activity"] for row in rows}
+
+    def remove(self, session_id: str, reason: Optional[str] = None) -> bool:
+        """Deletes a session; with a reason it is remembered as expired. Returns False if it was already gone."""
+        with self.db.transaction() as conn:
+            removed = conn.execute("DELETE FROM kernel_sessions WHERE session_id = ?", (session_id,)).rowcount
+            if removed and reason:
+                conn.execute(
+                    "INSERT OR REPLACE INTO expired_sessions (session_id, reason, expired_at) VALUES (?, ?, ?)",
+                    (session_id, reason, time.time()),
+                )
+        return bool(removed)
+
+    def is_expired(self, session_id: str) -> bool:
+        return self.db.connection().execute(
+            "SELECT 1 FROM expired_sessions WHERE session_id = ?", (session_id,)
+        ).fetchone() is not None
+
+    def orphans(self) -> List[Dict]:
+        """Sessions whose owning worker process is gone."""
+        rows = self.db.connection().execute(
+            "SELECT session_id, kernel_pid, kernel_started, owner_pid, last_activity FROM kernel_sessions "
+            "WHERE owner_pid != ?",
+            (os.getpid(),),
+        ).fetchall()
+        return [dict(row) for row in rows if not pid_alive(row["owner_pid"])]
+
+    def prune_expired(self) -> None:
+        with self.db.transaction() as conn:
+            conn.execute(
+                "DELETE FROM expired_sessions WHERE expired_at < ?", (time.time() - EXPIRED_SESSION_RETENTION,)
+            )
+            conn.execute(
+                "DELETE FROM execution_usage WHERE recorded_at < ?", (time.time() - EXECUTION_USAGE_RETENTION,)
+            )
+
+    # --- Execution resource usage ---
+    def record_usage(self, session_id: str, question_id: Optional[str], part_id: Optional[str], kind: str,
+                     usage: Dict) -> None:
+        """Stores the measured usage of one /run or /validate (see utils/resourceUsage.py)."""
+        with self.db.transaction() as conn:
+            conn.execute(
+                "INSERT INTO execution_usage (session_id, question_id, part_id, kind, executions, wall_ms, cpu_ms, "
+                "peak_rss_delta_kb, recorded_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (session_id, None if question_id is None else str(question_id), part_id or None, kind,
+                 usage.get("executions", 1), usage.get("wall_ms"), usage.get("cpu_ms"),
+                 usage.get("peak_rss_delta_kb"), time.time()),
+            )
+
+    def take_usage(self, session_id: str) -> Dict[Tuple[str, Optional[str]], Dict[str, Dict]]:
+        """
+        Totals per question part and kind ({("<question id>", "<part id>" or None):
+        {"run": {...}, "validate": {...}}}) for a session, deleting its rows: a
+        submission claims them once.
+        """
+        with self.db.transaction() as conn:
+            rows = conn.execute(
+                "SELECT question_id, part_id, kind, SUM(executions) AS executions, SUM(wall_ms) AS wall_ms, "
+                "SUM(cpu_ms) AS cpu_ms, MAX(peak_rss_delta_kb) AS peak_rss_delta_kb "
+                "FROM execution_usage WHERE session_id = ? AND question_id IS NOT NULL "
+                "GROUP BY question_id, part_id, kind",
+                (session_id,),
+            ).fetchall()
+            conn.execute("DELETE FROM execution_usage WHERE session_id = ?", (session_id,))
+        usage: Dict[Tuple[str, Optional[str]], Dict[str, Dict]] = {}
+        for row in rows:
+            totals = {key: row[key] for key in ("executions", "wall_ms", "cpu_ms", "peak_rss_delta_kb")}
+            for key in ("wall_ms", "cpu_ms"):
+                if totals[key] is not None:
+                    totals[key] = round(totals[key], 1)
+            usage.setdefault((row["question_id"], row["part_id"]), {})[row["kind"]] = totals
+        return usage
+
+    def count(self) -> int:
+        return self.db.connection().execute("SELECT COUNT(*) FROM kernel_sessions").fetchone()[0]
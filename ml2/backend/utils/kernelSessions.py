@@ -0,0 +1,327 @@
+# backend/utils/kernelSessions.py
+import os
+import time
+import signal
+import threading
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+from jupyter_client.blocking import BlockingKernelClient
+from jupyter_client.manager import KernelManager, KernelClient
+from utils.kernelPool import release_kernel_client, shutdown_kernel
+from utils.kernelRegistry import SharedKernelRegistry, kernel_alive
+
+try:
+    import psutil
+except ImportError:  # Memory-based eviction is disabled without psutil.
+    psutil = None
+
+# --- Configuration (overridable through environment variables) ---
+KERNEL_IDLE_TTL = int(os.getenv("KERNEL_IDLE_TTL", "1800"))  # seconds
+KERNEL_MEMORY_CEILING_MB = int(os.getenv("KERNEL_MEMORY_CEILING_MB", "0"))  # 0 disables eviction
+KERNEL_REAPER_INTERVAL = int(os.getenv("KERNEL_REAPER_INTERVAL", "60"))  # seconds
+# Minimum seconds between last-activity writes to the shared registry per session.
+KERNEL_ACTIVITY_WRITE_INTERVAL = int(os.getenv("KERNEL_ACTIVITY_WRITE_INTERVAL", "15"))
+MAX_EXPIRED_SESSIONS = 10000  # How many expired session ids to remember
+
+
+def kernel_pid(km: KernelManager) -> Optional[int]:
+    """Returns the OS process id of a locally started kernel, if known."""
+    provisioner = getattr(km, "provisioner", None)
+    pid = getattr(provisioner, "pid", None)
+    if pid is None and getattr(km, "kernel", None) is not None:
+        pid = getattr(km.kernel, "pid", None)
+    return pid
+
+
+def attach_kernel_client(connection_info: Dict) -> KernelClient:
+    """Connects a new client to a running kernel started by another process."""
+    kc = BlockingKernelClient()
+    kc.load_connection_info(connection_info)
+    kc.start_channels()
+    return kc
+
+
+def kernel_rss(km: KernelManager) -> int:
+    """Resident memory of a kernel process and its children, in bytes."""
+    pid = kernel_pid(km) if km is not None else None
+    if psutil is None or pid is None:
+        return 0
+    try:
+        proc = psutil.Process(pid)
+        return proc.memory_info().rss + sum(
+            child.memory_info().rss for child in proc.children(recursive=True)
+        )
+    except psutil.Error:
+        return 0
+
+
+class KernelSessionRegistry:
+    """
+    Maps session ids to their (KernelManager, KernelClient) pair and tracks
+    when each session was last used. Entries are kept in least-recently-used
+    order so the reaper can evict the coldest sessions first.
+
+    Sessions removed by the reaper are remembered as expired so routes can
+    tell the frontend to restart them instead of reporting "not found".
+
+    With a SharedKernelRegistry, sessions are also published to the other
+    worker processes. A worker that gets a request for a session it doesn't
+    hold attaches a client to that kernel and keeps it as (None, kc); the
+    worker that started the kernel (the owner) stays responsible for
+    reaping it.
+    """
+
+    def __init__(self, idle_ttl: int = KERNEL_IDLE_TTL, memory_ceiling_mb: int = KERNEL_MEMORY_CEILING_MB,
+                 shared: Optional[SharedKernelRegistry] = None):
+        self.idle_ttl = idle_ttl
+        self.memory_ceiling = memory_ceiling_mb * 1024 * 1024
+        self.shared = shared
+        self._sessions: "OrderedDict[str, Tuple[Optional[KernelManager], KernelClient]]" = OrderedDict()
+        self._last_activity: Dict[str, float] = {}
+        self._last_shared_write: Dict[str, float] = {}
+        self._expired: "OrderedDict[str, str]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._reaper = None
+        self.reaped_idle = 0
+        self.evicted_memory = 0
+
+    # --- Dict-like access ---
+    def __contains__(self, session_id: str) -> bool:
+        with self._lock:
+            if session_id in self._sessions:
+                return True
+        return self._shared_entry(session_id) is not None
+
+    def _shared_entry(self, session_id: str) -> Optional[Dict]:
+        """Shared registry row of a session whose kernel is still running (dead ones are marked lost)."""
+        entry = self.shared.lookup(session_id) if self.shared is not None else None
+        if entry is not None and entry["kernel_pid"] and not kernel_alive(entry):
+            self.shared.remove(session_id, "lost")
+            return None
+        return entry
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._sessions)
+
+    def __getitem__(self, session_id: str) -> Tuple[Optional[KernelManager], KernelClient]:
+        """
+        Returns the kernel for a session and marks the session as active,
+        attaching to it through the shared registry if another worker owns it.
+        """
+        now = time.monotonic()
+        with self._lock:
+            kernel = self._sessions.get(session_id)
+            if kernel is not None:
+                self._sessions.move_to_end(session_id)
+                self._last_activity[session_id] = now
+                write_shared = now - self._last_shared_write.get(session_id, 0) >= KERNEL_ACTIVITY_WRITE_INTERVAL
+                if write_shared:
+                    self._last_shared_write[session_id] = now
+        if kernel is not None:
+            if write_shared and self.shared is not None:
+                self.shared.touch(session_id)
+            return kernel
+        return self._attach(session_id)
+
+    def _attach(self, session_id: str) -> Tuple[None, KernelClient]:
+        entry = self._shared_entry(session_id)
+        if entry is None:
+            raise KeyError(session_id)
+        attached = (None, attach_kernel_client(entry["connection_info"]))
+        now = time.monotonic()
+        with self._lock:
+            existing = self._sessions.get(session_id)
+            if existing is None:
+                self._sessions[session_id] = attached
+                self._last_activity[session_id] = now
+                self._last_shared_write[session_id] = now
+        if existing is not None:
+            # Another request attached first; keep its client.
+            release_kernel_client(attached[1])
+            return existing
+        print(f"[SESSIONS] Attached to kernel of session {session_id} (owner pid {entry['owner_pid']})")
+        self.shared.touch(session_id)
+        return attached
+
+    def __setitem__(self, session_id: str, kernel: Tuple[KernelManager, KernelClient]) -> None:
+        now = time.monotonic()
+        with self._lock:
+            self._sessions[session_id] = kernel
+            self._sessions.move_to_end(session_id)
+            self._last_activity[session_id] = now
+            self._last_shared_write[session_id] = now
+            self._expired.pop(session_id, None)
+        if self.shared is not None:
+            km, _kc = kernel
+            self.shared.register(session_id, km.get_connection_info(), kernel_pid(km))
+
+    def pop(self, session_id: str) -> Tuple[Optional[KernelManager], KernelClient]:
+        """
+        Removes a session everywhere and returns its kernel for shutdown. For a
+        kernel owned by another worker this is an attached (None, kc) pair;
+        the owner drops its KernelManager on its next reaper pass.
+        """
+        with self._lock:
+            self._last_activity.pop(session_id, None)
+            self._last_shared_write.pop(session_id, None)
+            kernel = self._sessions.pop(session_id, None)
+        if kernel is None:
+            kernel = self._attach(session_id)
+            with self._lock:
+                self._sessions.pop(session_id, None)
+                self._last_activity.pop(session_id, None)
+                self._last_shared_write.pop(session_id, None)
+        if self.shared is not None:
+            self.shared.remove(session_id)
+        return kernel
+
+    def kernel_pid(self, session_id: str) -> Optional[int]:
+        """Process id of a session's kernel, also for kernels owned by another worker."""
+        with self._lock:
+            kernel = self._sessions.get(session_id)
+        if kernel is not None and kernel[0] is not None:
+            return kernel_pid(kernel[0])
+        entry = self.shared.lookup(session_id) if self.shared is not None else None
+        return entry["kernel_pid"] if entry is not None else None
+
+    def record_usage(self, session_id: str, question_id: Optional[str], part_id: Optional[str], kind: str,
+                     usage: Optional[Dict]) -> None:
+        """Keeps an execution's resource usage for the session's submission (needs the shared registry)."""
+        if usage and self.shared is not None:
+            self.shared.record_usage(session_id, question_id, part_id, kind, usage)
+
+    def take_usage(self, session_id: str) -> Dict[Tuple[str, Optional[str]], Dict[str, Dict]]:
+        return self.shared.take_usage(session_id) if self.shared is not None else {}
+
+    def is_expired(self, session_id: str) -> bool:
+        with self._lock:
+            if session_id in self._expired:
+                return True
+        return self.shared is not None and self.shared.is_expired(session_id)
+
+    # --- Reaping & eviction ---
+    def start_reaper(self, interval: int = KERNEL_REAPER_INTERVAL) -> None:
+        """Starts the background reaper thread. Safe to call more than once."""
+        with self._lock:
+            if self._reaper is not None:
+                return
+            self._reaper = threading.Thread(target=self._reap_loop, args=(interval,), name="kernel-reaper", daemon=True)
+            self._reaper.start()
+
+    def _reap_loop(self, interval: int) -> None:
+        while True:
+            time.sleep(interval)
+            try:
+                self.reap()
+            except Exception as e:
+                print(f"[REAPER] Error while reaping kernels: {e}")
+
+    def reap(self) -> None:
+        """Shuts down idle sessions, then evicts LRU sessions over the memory ceiling."""
+        if self.shared is not None:
+            self._sync_shared()
+
+        now = time.monotonic()
+        with self._lock:
+            idle = [sid for sid, last in self._last_activity.items() if now - last > self.idle_ttl]
+        for session_id in idle:
+            if self._expire(session_id, "idle"):
+                self.reaped_idle += 1
+                print(f"[REAPER] Shut down idle kernel for session: {session_id}")
+
+        if self.memory_ceiling <= 0 or psutil is None:
+            return
+        with self._lock:
+            # Least recently used first; only kernels this worker owns.
+            candidates = [(sid, kernel) for sid, kernel in self._sessions.items() if kernel[0] is not None]
+        usage = {sid: kernel_rss(km) for sid, (km, _kc) in candidates}
+        total = sum(usage.values())
+        for session_id, _kernel in candidates:
+            if total <= self.memory_ceiling:
+                break
+            if self._expire(session_id, "memory"):
+                self.evicted_memory += 1
+                total -= usage[session_id]
+                print(f"[REAPER] Evicted session {session_id} to free {usage[session_id] // (1024 * 1024)} MB")
+
+    def _sync_shared(self) -> None:
+        """
+        Reconciles local state with the shared registry:
+          - drops local sessions that another worker ended or expired
+          - folds activity seen by other workers into the idle clock
+          - cleans up sessions whose owner process died
+        """
+        with self._lock:
+            local_ids = list(self._sessions)
+        shared_activity = self.shared.last_activity(local_ids)
+        wall_now, now = time.time(), time.monotonic()
+        for session_id in local_ids:
+            if session_id not in shared_activity:
+                with self._lock:
+                    kernel = self._sessions.pop(session_id, None)
+                    self._last_activity.pop(session_id, None)
+                    self._last_shared_write.pop(session_id, None)
+                if kernel is not None:
+                    km, kc = kernel
+                    if km is None:
+                        release_kernel_client(kc)  # Just our attachment; the owner shuts the kernel down.
+                    else:
+                        shutdown_kernel(km, kc)
+                continue
+            seen_at = now - (wall_now - shared_activity[session_id])
+            with self._lock:
+                if session_id in self._last_activity and seen_at > self._last_activity[session_id]:
+                    self._last_activity[session_id] = seen_at
+
+        for orphan in self.shared.orphans():
+            alive = kernel_alive(orphan)
+            if alive and wall_now - orphan["last_activity"] <= self.idle_ttl:
+                continue  # Still attachable; reaped once idle.
+            if self.shared.remove(orphan["session_id"], "idle" if alive else "lost"):
+                # Only a process with the start time recorded at registration is
+                # the kernel; a reused pid belongs to someone else.
+                if alive and orphan["kernel_started"] is not None:
+                    os.kill(orphan["kernel_pid"], signal.SIGKILL)
+                print(f"[REAPER] Removed session {orphan['session_id']} of dead worker {orphan['owner_pid']}")
+        self.shared.prune_expired()
+
+    def _expire(self, session_id: str, reason: str) -> bool:
+        with self._lock:
+            kernel = self._sessions.pop(session_id, None)
+            self._last_activity.pop(session_id, None)
+            self._last_shared_write.pop(session_id, None)
+            if kernel is None:
+                return False
+            self._expired[session_id] = reason
+            while len(self._expired) > MAX_EXPIRED_SESSIONS:
+                self._expired.popitem(last=False)
+        km, kc = kernel
+        if km is None:
+            # Attached client only: the owner decides when the kernel is idle.
+            release_kernel_client(kc)
+            with self._lock:
+                self._expired.pop(session_id, None)
+            return False
+        if self.shared is not None:
+            self.shared.remove(session_id, reason)
+        shutdown_kernel(km, kc)
+        return True
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            kernels = [km for km, _kc in self._sessions.values() if km is not None]
+            stats = {
+                "active_sessions": len(kernels),
+                "attached_sessions": len(self._sessions) - len(kernels),
+                "idle_ttl_seconds": self.idle_ttl,
+                "memory_ceiling_mb": self.memory_ceiling // (1024 * 1024),
+                "reaped_idle": self.reaped_idle,
+                "evicted_memory": self.evicted_memory,
+            }
+        if self.shared is not None:
+            stats["shared_sessions"] = self.shared.count()
+        if psutil is not None:
+            stats["total_rss_mb"] = sum(kernel_rss(km) for km in kernels) // (1024 * 1024)
+        return stats
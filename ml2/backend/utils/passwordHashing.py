@@ -0,0 +1,98 @@
+# backend/utils/passwordHashing.py
+import os
+import threading
+import multiprocessing
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Iterable, Iterator, Optional
+
+import bcrypt
+
+# --- Configuration (overridable through environment variables) ---
+# bcrypt work is CPU bound; a small fixed pool keeps a login burst from
+# saturating every core or piling up on the request threads.
+BCRYPT_WORKERS = int(os.getenv("BCRYPT_WORKERS", str(min(4, os.cpu_count() or 1))))
+BCRYPT_TIMEOUT = float(os.getenv("BCRYPT_TIMEOUT", "30"))
+# Work factor for new hashes unless the caller passes one (12 is bcrypt.gensalt()'s default).
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", "12"))
+
+
+def _checkpw(password: bytes, hashed: bytes) -> bool:
+    return bcrypt.checkpw(password, hashed)
+
+
+def _hashpw(password: bytes, rounds: int) -> str:
+    return bcrypt.hashpw(password, bcrypt.gensalt(rounds)).decode("utf-8")
+
+
+def _noop() -> None:
+    return None
+
+
+class PasswordHasher:
+    """
+    Runs bcrypt checks and hashes in a bounded process pool.
+
+    Workers are forked on first use; call start() early (before the kernel
+    pool and other threads are running) so the fork happens from a quiet
+    process.
+    """
+
+    def __init__(self, workers: int = BCRYPT_WORKERS):
+        self.workers = workers
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    def _pool(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                methods = multiprocessing.get_all_start_methods()
+                context = multiprocessing.get_context("fork") if "fork" in methods else None
+                self._executor = ProcessPoolExecutor(max_workers=self.workers, mp_context=context)
+            return self._executor
+
+    def _reset(self) -> None:
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
+
+    def start(self) -> None:
+        self._pool().submit(_noop).result()
+
+    def shutdown(self) -> None:
+        self._reset()
+
+    def _run(self, fn, *args):
+        try:
+            return self._pool().submit(fn, *args).result(timeout=BCRYPT_TIMEOUT)
+        except BrokenProcessPool:
+            # A worker died (e.g. OOM killed); start a fresh pool and retry once.
+            print("[BCRYPT] Process pool broken, restarting it")
+            self._reset()
+            return self._pool().submit(fn, *args).result(timeout=BCRYPT_TIMEOUT)
+
+    def check(self, password: str, hashed: str) -> bool:
+        return self._run(_checkpw, password.encode("utf-8"), hashed.encode("utf-8"))
+
+    def hash(self, password: str, rounds: int = BCRYPT_ROUNDS) -> str:
+        return self._run(_hashpw, password.encode("utf-8"), rounds)
+
+    def hash_many(self, passwords: Iterable[str], rounds: int = BCRYPT_ROUNDS) -> Iterator[str]:
+        """
+        Hashes a stream of passwords across the pool and yields the hashes in
+        input order. At most two jobs per worker are in flight, so the input
+        is consumed lazily rather than queued all at once.
+        """
+        pool = self._pool()
+        in_flight = deque()
+        for password in passwords:
+            in_flight.append(pool.submit(_hashpw, password.encode("utf-8"), rounds))
+            if len(in_flight) >= self.workers * 2:
+                yield in_flight.popleft().result(timeout=BCRYPT_TIMEOUT)
+        while in_flight:
+            yield in_flight.popleft().result(timeout=BCRYPT_TIMEOUT)
+
+
+PASSWORD_HASHER = PasswordHasher()
@@ -1,41 +1,50 @@
 # backend/utils/progress_helper.py
-import os
-from pathlib import Path
-
-# Base path for questions folder
-QUESTIONS_BASE_PATH = Path(__file__).resolve().parent.parent / "data" / "questions"
+from utils.questionCatalog import QUESTION_CATALOG
 
 
 def build_initial_progress():
     """
-    Scans the entire /data/questions directory and builds a complete
-    level-based progress object. Level 1 is unlocked, others are locked.
+    Builds a complete level-based progress object from the question catalog.
+    Level 1 is unlocked, others are locked.
     :return: dict representing initial progress object
     """
-    initial_progress = {}
-
     try:
-        # Loop through subjects (directories inside questions/)
-        for subject in os.listdir(QUESTIONS_BASE_PATH):
-            subject_path = QUESTIONS_BASE_PATH / subject
-            if subject_path.is_dir():
-                initial_progress[subject] = {}
-
-                # List and sort levels numerically
-                levels = [
-                    lvl
-                    for lvl in os.listdir(subject_path)
-                    if lvl.startswith("level")
-                ]
-                sorted_levels = sorted(
-                    levels, key=lambda x: int(x.replace("level", ""))
-                )
-
-                # Mark level1 unlocked, others locked
-                for i, level in enumerate(sorted_levels):
-                    initial_progress[subject][level] = "unlocked" if i == 0 else "locked"
-
+        return QUESTION_CATALOG.build_initial_progress()
     except Exception as e:
         print("Error building initial progress:", e)
+        return {}
+
+
+def is_default_status(level, status):
+    """True if `status` is what the level derives to without any stored progress."""
+    return status == ("unlocked" if level == "level1" else "locked")
+
 
-    return initial_progress
+def progress_deltas(progress):
+    """
+    Strips a full progress object down to what has to be stored: the entries
+    that differ from the defaults (completed levels and unlocked levels past 1).
+    """
+    deltas = {}
+    for subject, levels in (progress or {}).items():
+        changed = {level: status for level, status in levels.items() if not is_default_status(level, status)}
+        if changed:
+            deltas[subject] = changed
+    return deltas
+
+
+def derive_progress(stored_progress):
+    """
+    Full progress object for a user: every subject/level currently in the
+    question catalog at its default status, overlaid with the stored deltas.
+    Subjects and levels added later show up without touching any user.
+    """
+    progress = build_initial_progress()
+    for subject, levels in (stored_progress or {}).items():
+        subject_progress = progress.get(subject)
+        if subject_progress is None:
+            continue
+        for level, status in levels.items():
+            if level in subject_progress:
+                subject_progress[level] = status
+    return progress
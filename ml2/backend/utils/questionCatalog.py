@@ -0,0 +1,199 @@
+# backend/utils/questionCatalog.py
+import os
+import json
+import time
+import hashlib
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+# Base path for questions folder
+QUESTIONS_BASE_PATH = Path(__file__).resolve().parent.parent / "data" / "questions"
+
+# --- Configuration (overridable through environment variables) ---
+# How often (seconds) the tree is re-checked for changed questions.json files.
+CATALOG_CHECK_INTERVAL = float(os.getenv("CATALOG_CHECK_INTERVAL", "2"))
+
+
+def level_dir_name(level) -> str:
+    """Accepts 2, "2" or "level2" and returns "level2"."""
+    level = str(level)
+    return level if level.startswith("level") else f"level{level}"
+
+
+def write_questions_file(file_path: Path, questions: List[Dict]) -> None:
+    """
+    Writes a questions.json atomically (temp file + rename), so the catalog and
+    concurrent readers never see a half-written file.
+    """
+    file_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = file_path.with_name(f".{file_path.name}.{os.getpid()}.tmp")
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(questions, f, indent=2)
+    os.replace(tmp_path, file_path)
+
+
+def serialize(data) -> bytes:
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+class LevelQuestions:
+    """
+    Parsed questions.json for one subject/level plus an index by (id, part_id).
+    content_hash is the SHA-256 of the file bytes; serialized response bodies
+    are built on first use and reused until the file changes.
+    """
+
+    def __init__(self, mtime_ns: int, questions: List[Dict], content_hash: str = ""):
+        self.mtime_ns = mtime_ns
+        self.questions = questions
+        self.content_hash = content_hash
+        self._body: Optional[bytes] = None
+        self._question_bodies: Dict[int, bytes] = {}
+        self.index: Dict[Tuple[str, Optional[str]], Dict] = {}
+        for question in questions:
+            if not isinstance(question, dict) or 'id' not in question:
+                continue
+            self.index[(question['id'], None)] = question
+            for part in question.get('parts', []):
+                if 'part_id' in part:
+                    self.index[(question['id'], part['part_id'])] = part
+
+    def find(self, question_id: str, part_id: Optional[str] = None) -> Optional[Dict]:
+        """
+        Returns the part `part_id` of question `question_id`, or the question
+        itself when no part_id is given or the part doesn't exist.
+        """
+        question = self.index.get((question_id, None))
+        if question is None or not part_id:
+            return question
+        return self.index.get((question_id, part_id), question)
+
+    def body(self) -> bytes:
+        """All questions serialized as a JSON array."""
+        if self._body is None:
+            self._body = serialize(self.questions)
+        return self._body
+
+    def pick_index(self, seed: str) -> int:
+        """Deterministic question index for a seed (e.g. an exam session id)."""
+        digest = hashlib.sha256(f"{seed}:{self.content_hash}".encode("utf-8")).digest()
+        return int.from_bytes(digest[:8], "big") % len(self.questions)
+
+    def question_body(self, index: int) -> bytes:
+        """One question serialized as a JSON object."""
+        body = self._question_bodies.get(index)
+        if body is None:
+            body = self._question_bodies[index] = serialize(self.questions[index])
+        return body
+
+
+class QuestionCatalog:
+    """
+    In-memory catalog of every subject/level under data/questions.
+
+    The whole tree is loaded once; afterwards it is re-checked at most every
+    CATALOG_CHECK_INTERVAL seconds and only questions.json files whose mtime
+    changed are re-parsed. Routes that write question files call refresh(force=True)
+    so their own changes are visible immediately.
+
+    Returned question lists and dicts are shared and must not be modified.
+    """
+
+    def __init__(self, base_path: Path = QUESTIONS_BASE_PATH):
+        self.base_path = base_path
+        self._structure: Dict[str, List[str]] = {}
+        self._levels: Dict[Tuple[str, str], LevelQuestions] = {}
+        self._lock = threading.Lock()
+        self._last_check = 0.0
+        self._structure_etag = ""
+        self.reloads = 0
+
+    # --- Loading ---
+    def refresh(self, force: bool = False) -> None:
+        """Re-scans the tree and re-parses changed files (rate limited unless forced)."""
+        with self._lock:
+            now = time.monotonic()
+            if not force and self._last_check and now - self._last_check < CATALOG_CHECK_INTERVAL:
+                return
+            self._last_check = now
+
+            structure: Dict[str, List[str]] = {}
+            levels: Dict[Tuple[str, str], LevelQuestions] = {}
+            if self.base_path.exists():
+                for subject_entry in os.scandir(self.base_path):
+                    if not subject_entry.is_dir():
+                        continue
+                    level_names = [
+                        entry.name for entry in os.scandir(subject_entry.path)
+                        if entry.is_dir() and entry.name.startswith("level") and entry.name[5:].isdigit()
+                    ]
+                    # Sort the levels naturally (e.g., level1, level2, level10)
+                    level_names.sort(key=lambda name: int(name.replace("level", "")))
+                    structure[subject_entry.name] = level_names
+
+                    for level_name in level_names:
+                        key = (subject_entry.name, level_name)
+                        loaded = self._load_level(key, self._levels.get(key))
+                        if loaded is not None:
+                            levels[key] = loaded
+            if structure != self._structure or not self._structure_etag:
+                self._structure_etag = hashlib.sha256(serialize(structure)).hexdigest()
+            self._structure = structure
+            self._levels = levels
+
+    def _load_level(self, key: Tuple[str, str], previous: Optional[LevelQuestions]) -> Optional[LevelQuestions]:
+        file_path = self.base_path / key[0] / key[1] / "questions.json"
+        try:
+            mtime_ns = file_path.stat().st_mtime_ns
+        except FileNotFoundError:
+            return None
+        if previous is not None and previous.mtime_ns == mtime_ns:
+            return previous
+        try:
+            raw = file_path.read_bytes()
+            questions = json.loads(raw.decode('utf-8'))
+        except (OSError, ValueError) as e:
+            print(f"[CATALOG] Could not load {file_path}: {e}")
+            return previous
+        self.reloads += 1
+        content_hash = hashlib.sha256(raw).hexdigest()
+        return LevelQuestions(mtime_ns, questions if isinstance(questions, list) else [], content_hash)
+
+    # --- Lookups ---
+    def structure(self) -> Dict[str, List[str]]:
+        """{subject: ["level1", "level2", ...]} for every subject directory."""
+        self.refresh()
+        return self._structure
+
+    def structure_etag(self) -> str:
+        """Content hash of structure(); changes whenever a subject or level is added or removed."""
+        self.refresh()
+        return self._structure_etag
+
+    def get_level(self, subject: str, level) -> Optional[LevelQuestions]:
+        self.refresh()
+        return self._levels.get((subject, level_dir_name(level)))
+
+    def get_questions(self, subject: str, level) -> Optional[List[Dict]]:
+        """All questions of a level, or None if the level has no questions.json."""
+        entry = self.get_level(subject, level)
+        return entry.questions if entry is not None else None
+
+    def get_question(self, subject: str, level, question_id: str, part_id: Optional[str] = None) -> Optional[Dict]:
+        """See LevelQuestions.find; None if the level doesn't exist."""
+        entry = self.get_level(subject, level)
+        return entry.find(question_id, part_id) if entry is not None else None
+
+    def questions_file(self, subject: str, level) -> Path:
+        return self.base_path / subject / level_dir_name(level) / "questions.json"
+
+    def build_initial_progress(self) -> Dict[str, Dict[str, str]]:
+        """Level 1 of every subject unlocked, all other levels locked."""
+        return {
+            subject: {level: "unlocked" if i == 0 else "locked" for i, level in enumerate(levels)}
+            for subject, levels in self.structure().items()
+        }
+
+
+QUESTION_CATALOG = QuestionCatalog()
@@ -0,0 +1,102 @@
+# backend/utils/resourceUsage.py
+import os
+import time
+from typing import Dict, Iterable, Optional
+
+CLOCK_TICKS = os.sysconf("SC_CLK_TCK") if hasattr(os, "sysconf") else 100
+
+
+def _read_cpu_seconds(pid: int) -> float:
+    """utime + stime of the process plus its waited-for children (/proc/<pid>/stat fields 14-17)."""
+    with open(f"/proc/{pid}/stat", "r") as f:
+        # The command name may contain spaces; the numeric fields start after its closing paren.
+        fields = f.read().rsplit(")", 1)[1].split()
+    return sum(int(value) for value in fields[11:15]) / CLOCK_TICKS
+
+
+def _read_memory_kb(pid: int) -> Dict[str, int]:
+    """VmRSS (current) and VmHWM (peak) of the process, in kB."""
+    memory = {}
+    with open(f"/proc/{pid}/status", "r") as f:
+        for line in f:
+            if line.startswith(("VmRSS:", "VmHWM:")):
+                name, value = line.split(":", 1)
+                memory[name] = int(value.split()[0])
+    return memory
+
+
+def _reset_peak_rss(pid: int) -> bool:
+    """Resets VmHWM to the current RSS (Linux 4.0+); False if not permitted or not supported."""
+    try:
+        with open(f"/proc/{pid}/clear_refs", "w") as f:
+            f.write("5")
+        return True
+    except OSError:
+        return False
+
+
+class ResourceMeter:
+    """
+    Measures one kernel execution, sampled from the kernel process:
+
+        with ResourceMeter(pid) as meter:
+            stdout, stderr = await run_code_on_kernel(kc, code)
+        meter.usage  # {"wall_ms": ..., "cpu_ms": ..., "peak_rss_delta_kb": ...}
+
+    wall_ms is the time the request waited for the execution. cpu_ms is the
+    kernel's user + system time. peak_rss_delta_kb is how far the kernel's
+    peak resident memory rose above its RSS at the start (the peak is reset
+    first; where that is not allowed it is the growth of the lifetime peak).
+    Without a pid or /proc only wall_ms is reported; the others are None.
+    """
+
+    def __init__(self, pid: Optional[int]):
+        self.pid = pid
+        self.usage: Dict = {}
+        self._started = 0.0
+        self._cpu = None
+        self._baseline_kb = None
+
+    def __enter__(self) -> "ResourceMeter":
+        if self.pid:
+            try:
+                self._cpu = _read_cpu_seconds(self.pid)
+                memory = _read_memory_kb(self.pid)
+                self._baseline_kb = memory["VmRSS"] if _reset_peak_rss(self.pid) else memory["VmHWM"]
+            except (OSError, KeyError, ValueError, IndexError):
+                self._cpu, self._baseline_kb = None, None
+        self._started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        wall_ms = (time.perf_counter() - self._started) * 1000
+        cpu_ms, peak_delta_kb = None, None
+        if self._cpu is not None:
+            try:
+                cpu_ms = round((_read_cpu_seconds(self.pid) - self._cpu) * 1000, 1)
+                peak_delta_kb = max(0, _read_memory_kb(self.pid)["VmHWM"] - self._baseline_kb)
+            except (OSError, KeyError, ValueError, IndexError):
+                pass  # The kernel died or was replaced mid-execution.
+        self.usage = {"wall_ms": round(wall_ms, 1), "cpu_ms": cpu_ms, "peak_rss_delta_kb": peak_delta_kb}
+
+
+def combine_usage(usages: Iterable[Dict]) -> Optional[Dict]:
+    """
+    Totals for several executions: wall and CPU time are summed (kernel-busy
+    time), the memory figure is the largest peak. None when there were none.
+    """
+    usages = [usage for usage in usages if usage]
+    if not usages:
+        return None
+
+    def total(key):
+        values = [usage[key] for usage in usages if usage.get(key) is not None]
+        return round(sum(values), 1) if values else None
+
+    peaks = [usage["peak_rss_delta_kb"] for usage in usages if usage.get("peak_rss_delta_kb") is not None]
+    return {
+        "executions": sum(usage.get("executions", 1) for usage in usages),
+        "wall_ms": total("wall_ms"),
+        "cpu_ms": total("cpu_ms"),
+        "peak_rss_delta_kb": max(peaks) if peaks else None,
+    }
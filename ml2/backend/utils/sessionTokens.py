@@ -0,0 +1,116 @@
+# backend/utils/sessionTokens.py
+import os
+import hmac
+import json
+import time
+import base64
+import hashlib
+import secrets
+from functools import wraps
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+from flask import g, jsonify, request
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+SESSION_SECRET_PATH = BASE_DIR / "data" / ".session_secret"
+
+# --- Configuration (overridable through environment variables) ---
+# Lifetime of a login token in seconds (default 3 hours, enough for one exam sitting).
+SESSION_TOKEN_TTL = int(os.getenv("SESSION_TOKEN_TTL", "10800"))
+
+
+def _load_secret() -> bytes:
+    """
+    SESSION_SECRET from the environment, otherwise a random key persisted in
+    data/.session_secret so tokens survive restarts and are shared by workers.
+    """
+    secret = os.getenv("SESSION_SECRET")
+    if secret:
+        return secret.encode("utf-8")
+    if SESSION_SECRET_PATH.exists():
+        return SESSION_SECRET_PATH.read_bytes().strip()
+    # Write the key to a private temp file and hard-link it into place: if
+    # several workers start at once, exactly one key wins and nobody reads a
+    # half-written file.
+    tmp_path = SESSION_SECRET_PATH.with_name(f"{SESSION_SECRET_PATH.name}.{os.getpid()}")
+    fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    with os.fdopen(fd, "wb") as f:
+        f.write(secrets.token_hex(32).encode("ascii"))
+    try:
+        os.link(tmp_path, SESSION_SECRET_PATH)
+    except FileExistsError:
+        pass
+    finally:
+        os.unlink(tmp_path)
+    return SESSION_SECRET_PATH.read_bytes().strip()
+
+
+SESSION_SECRET = _load_secret()
+
+
+def _b64encode(raw: bytes) -> str:
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode("ascii")
+
+
+def _b64decode(text: str) -> bytes:
+    return base64.urlsafe_b64decode(text + "=" * (-len(text) % 4))
+
+
+def _sign(payload: str) -> str:
+    return _b64encode(hmac.new(SESSION_SECRET, payload.encode("ascii"), hashlib.sha256).digest())
+
+
+def issue_token(user: Dict) -> str:
+    """Signed token "<payload>.<signature>" carrying the username, role and expiry."""
+    claims = {"sub": user["username"], "role": user.get("role", "student"), "exp": int(time.time()) + SESSION_TOKEN_TTL}
+    payload = _b64encode(json.dumps(claims, separators=(",", ":")).encode("utf-8"))
+    return f"{payload}.{_sign(payload)}"
+
+
+def verify_token(token: str) -> Optional[Dict]:
+    """Claims of a valid, unexpired token, otherwise None. No I/O, no bcrypt."""
+    payload, _, signature = token.partition(".")
+    if not payload or not signature or not hmac.compare_digest(signature, _sign(payload)):
+        return None
+    try:
+        claims = json.loads(_b64decode(payload))
+    except ValueError:
+        return None
+    if claims.get("exp", 0) < time.time():
+        return None
+    return claims
+
+
+def authorize(header: str, roles: Tuple[str, ...] = ()) -> Tuple[Optional[Dict], Optional[Tuple[Dict, int]]]:
+    """
+    Checks an "Authorization: Bearer <token>" header value. Returns (claims, None),
+    or (None, (error_body, status)) for a missing/invalid token (401) or a
+    role outside `roles` (403). Shared by token_required and the ASGI routes.
+    """
+    scheme, _, token = (header or "").partition(" ")
+    claims = verify_token(token.strip()) if scheme.lower() == "bearer" else None
+    if claims is None:
+        return None, ({"message": "Authentication required.", "tokenExpired": bool(token)}, 401)
+    if roles and claims.get("role") not in roles:
+        return None, ({"message": "Not allowed."}, 403)
+    return claims, None
+
+
+def token_required(*roles: str):
+    """
+    Route decorator: requires "Authorization: Bearer <token>" from /api/auth/login.
+    With roles given, the token's role must be one of them. The claims are
+    available to the view as g.auth.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            claims, error = authorize(request.headers.get("Authorization", ""), roles)
+            if error:
+                body, status = error
+                return jsonify(body), status
+            g.auth = claims
+            return view(*args, **kwargs)
+        return wrapper
+    return decorator
@@ -0,0 +1,83 @@
+# backend/utils/solutionCache.py
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+import pandas as pd
+
+from utils.tabularFiles import read_table
+
+# --- Configuration (overridable through environment variables) ---
+SOLUTION_CACHE_MAX_MB = int(os.getenv("SOLUTION_CACHE_MAX_MB", "256"))
+
+
+class SolutionCache:
+    """
+    Process-wide cache of parsed solution files (CSV or a binary format, see
+    utils/tabularFiles.py). Every student is compared against the same
+    solution, so it is parsed once and reused until its mtime changes. Frames
+    keyed by a merge column are also cached, pre-indexed by that column.
+    Entries are evicted least-recently-used once their combined in-memory
+    size passes SOLUTION_CACHE_MAX_MB.
+
+    Cached frames are shared between requests and must not be modified.
+    """
+
+    def __init__(self, max_mb: int = SOLUTION_CACHE_MAX_MB):
+        self.max_bytes = max_mb * 1024 * 1024
+        # (path, merge_key or None) -> (mtime_ns, frame, size_bytes)
+        self._entries: "OrderedDict[Tuple[str, Optional[str]], Tuple[int, pd.DataFrame, int]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, path: Path) -> pd.DataFrame:
+        """Returns the parsed solution file."""
+        return self._get_or_load(path, None)
+
+    def get_indexed(self, path: Path, merge_key: str) -> pd.DataFrame:
+        """Returns the solution file indexed by `merge_key` (raises KeyError if the column is missing)."""
+        return self._get_or_load(path, merge_key)
+
+    def _get_or_load(self, path: Path, merge_key: Optional[str]) -> pd.DataFrame:
+        key = (str(path), merge_key)
+        mtime = path.stat().st_mtime_ns
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == mtime:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+
+        if merge_key is None:
+            frame = read_table(path)
+        else:
+            frame = self.get(path).set_index(merge_key, drop=False)
+            frame.index.name = None  # Keep the key as a plain column too.
+        size = int(frame.memory_usage(index=True, deep=True).sum())
+
+        with self._lock:
+            self._entries[key] = (mtime, frame, size)
+            self._entries.move_to_end(key)
+            self._evict()
+        return frame
+
+    def _evict(self) -> None:
+        """Drops least-recently-used frames until the cache fits. Caller holds the lock."""
+        total = sum(size for _mtime, _frame, size in self._entries.values())
+        while total > self.max_bytes and len(self._entries) > 1:
+            _key, (_mtime, _frame, size) = self._entries.popitem(last=False)
+            total -= size
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "size_mb": sum(size for _m, _f, size in self._entries.values()) // (1024 * 1024),
+                "max_mb": self.max_bytes // (1024 * 1024),
+                "hits": self.hits,
+                "misses": self.misses,
+            }
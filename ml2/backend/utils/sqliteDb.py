@@ -0,0 +1,40 @@
+# backend/utils/sqliteDb.py
+import sqlite3
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+
+
+class SqliteDb:
+    """
+    Thread-local SQLite connections to one WAL-mode database file.
+    `transaction()` wraps a block in BEGIN IMMEDIATE ... COMMIT/ROLLBACK.
+    """
+
+    def __init__(self, db_path: Path, schema: str = ""):
+        self.db_path = db_path
+        self._local = threading.local()
+        if schema:
+            self.connection().executescript(schema)
+
+    def connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=10, isolation_level=None)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA foreign_keys=ON")
+            self._local.conn = conn
+        return conn
+
+    @contextmanager
+    def transaction(self):
+        conn = self.connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield conn
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
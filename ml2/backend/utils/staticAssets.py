@@ -0,0 +1,145 @@
+# backend/utils/staticAssets.py
+import os
+import re
+import gzip
+import hashlib
+import mimetypes
+from pathlib import Path
+from typing import Dict, Optional
+
+try:
+    import brotli  # optional: pip install brotli
+except ImportError:
+    brotli = None
+
+FRONTEND_DIST_PATH = Path(__file__).resolve().parent.parent.parent / "frontend" / "dist"
+
+# --- Configuration (overridable through environment variables) ---
+# Files smaller than this are served as-is; compression would not pay off.
+STATIC_COMPRESS_MIN_SIZE = int(os.getenv("STATIC_COMPRESS_MIN_SIZE", "1024"))  # bytes
+
+# Vite emits content-hashed bundles as assets/<name>-<hash>.<ext>; a changed
+# file gets a new name, so these can be cached forever.
+HASHED_ASSET_RE = re.compile(r"^assets/.+-[A-Za-z0-9_-]{8,}\.[A-Za-z0-9]+$")
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+# index.html and unhashed files (favicon, templates) must be revalidated.
+REVALIDATE_CACHE_CONTROL = "no-cache"
+
+COMPRESSIBLE_TYPES = ("text/", "application/javascript", "application/json", "image/svg+xml", "application/wasm")
+
+# Preferred order when the client accepts several encodings.
+ENCODINGS = ("br", "gzip")
+ENCODING_SUFFIXES = {"br": ".br", "gzip": ".gz"}
+
+
+class StaticAsset:
+    """One file of the build, held in memory with its precompressed variants."""
+
+    def __init__(self, rel_path: str, body: bytes, mimetype: str, cache_control: str):
+        self.rel_path = rel_path
+        self.mimetype = mimetype
+        self.cache_control = cache_control
+        self.etag = hashlib.sha256(body).hexdigest()[:32]
+        self.variants: Dict[Optional[str], bytes] = {None: body}
+
+    def add_variant(self, encoding: str, body: bytes) -> None:
+        # Only worth keeping if it actually saves bytes.
+        if len(body) < len(self.variants[None]):
+            self.variants[encoding] = body
+
+    def select(self, accept_encoding: str):
+        """(encoding, body) for the client's Accept-Encoding; encoding None means identity."""
+        accepted = parse_accept_encoding(accept_encoding)
+        for encoding in ENCODINGS:
+            if encoding in self.variants and accepted.get(encoding, accepted.get("*", 0)) > 0:
+                return encoding, self.variants[encoding]
+        return None, self.variants[None]
+
+
+def parse_accept_encoding(header: str) -> Dict[str, float]:
+    """{"gzip": 1.0, "br": 0.0, ...} from an Accept-Encoding header."""
+    accepted = {}
+    for item in (header or "").split(","):
+        name, _, params = item.strip().partition(";")
+        name = name.strip().lower()
+        if not name:
+            continue
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        accepted[name] = quality
+    return accepted
+
+
+def _compress(encoding: str, body: bytes) -> Optional[bytes]:
+    if encoding == "gzip":
+        return gzip.compress(body, compresslevel=9, mtime=0)
+    if encoding == "br" and brotli is not None:
+        return brotli.compress(body, quality=11)
+    return None
+
+
+def _load_variant(path: Path, encoding: str, body: bytes) -> Optional[bytes]:
+    """A prebuilt <file>.gz/.br from the build if it is up to date, otherwise compressed here once."""
+    prebuilt = path.with_name(path.name + ENCODING_SUFFIXES[encoding])
+    if prebuilt.is_file() and prebuilt.stat().st_mtime_ns >= path.stat().st_mtime_ns:
+        return prebuilt.read_bytes()
+    return _compress(encoding, body)
+
+
+class StaticAssetIndex:
+    """
+    The frontend build (frontend/dist) indexed once at startup.
+
+    Every file is read into memory together with its gzip/brotli variants, so
+    a request is a dict lookup: no filesystem check, no per-request
+    compression. Unknown paths fall back to index.html for client-side routing.
+    """
+
+    def __init__(self, dist_path: Path = FRONTEND_DIST_PATH):
+        self.dist_path = dist_path
+        self.assets: Dict[str, StaticAsset] = {}
+        self.load()
+
+    def load(self) -> None:
+        assets = {}
+        if self.dist_path.is_dir():
+            for path in sorted(self.dist_path.rglob("*")):
+                if not path.is_file() or path.suffix in (".gz", ".br"):
+                    continue
+                rel_path = path.relative_to(self.dist_path).as_posix()
+                assets[rel_path] = self._load_asset(path, rel_path)
+        self.assets = assets
+
+        compressed = sum(1 for asset in assets.values() if len(asset.variants) > 1)
+        print(f"[STATIC] Indexed {len(assets)} files from {self.dist_path} ({compressed} with compressed variants"
+              f"{'' if brotli is not None else ', brotli module not installed'})")
+
+    def _load_asset(self, path: Path, rel_path: str) -> StaticAsset:
+        body = path.read_bytes()
+        mimetype = mimetypes.guess_type(rel_path)[0] or "application/octet-stream"
+        cache_control = IMMUTABLE_CACHE_CONTROL if HASHED_ASSET_RE.match(rel_path) else REVALIDATE_CACHE_CONTROL
+        asset = StaticAsset(rel_path, body, mimetype, cache_control)
+
+        if len(body) >= STATIC_COMPRESS_MIN_SIZE and mimetype.startswith(COMPRESSIBLE_TYPES):
+            for encoding in ENCODINGS:
+                variant = _load_variant(path, encoding, body)
+                if variant is not None:
+                    asset.add_variant(encoding, variant)
+        return asset
+
+    def lookup(self, path: str) -> Optional[StaticAsset]:
+        """
+        The asset for a request path, index.html for unknown app routes. None for
+        a missing bundle file (a stale hashed name must 404, not get HTML) or
+        when there is no build.
+        """
+        path = path.lstrip("/")
+        asset = self.assets.get(path)
+        if asset is None and not path.startswith("assets/"):
+            asset = self.assets.get("index.html")
+        return asset
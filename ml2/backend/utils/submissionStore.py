@@ -0,0 +1,237 @@
+# backend/utils/submissionStore.py
+import json
+import base64
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from utils.sqliteDb import SqliteDb
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+SUBMISSIONS_PATH = BASE_DIR / "data" / "submissions"
+SUBMISSIONS_DB_PATH = BASE_DIR / "data" / "submissions.db"
+
+MAX_PAGE_SIZE = 500
+
+
+def encode_cursor(timestamp: str, submission_id: int) -> str:
+    return base64.urlsafe_b64encode(f"{timestamp}|{submission_id}".encode("utf-8")).decode("ascii")
+
+
+def decode_cursor(cursor: str) -> Tuple[str, int]:
+    """Inverse of encode_cursor; raises ValueError on a malformed cursor."""
+    try:
+        timestamp, _, submission_id = base64.urlsafe_b64decode(cursor.encode("ascii")).decode("utf-8").rpartition("|")
+        return timestamp, int(submission_id)
+    except Exception as e:
+        raise ValueError(f"Invalid cursor: {cursor}") from e
+
+
+class SubmissionStore:
+    """
+    Append-only log of exam submissions. Each submit is a single INSERT; the
+    full submission dict is kept as JSON next to the columns used for lookups.
+    Rows are never updated, so insertion order is submission order.
+
+    Two small tables are maintained on every append so the admin views never
+    scan the whole history:
+      submission_latest   the latest attempt of each user per (subject, level)
+      submission_levels   per (subject, level) attempt/passed/failed/student counts
+    """
+
+    SCHEMA = """
+    CREATE TABLE IF NOT EXISTS submissions (
+        id        INTEGER PRIMARY KEY AUTOINCREMENT,
+        username  TEXT NOT NULL,
+        subject   TEXT NOT NULL,
+        level     TEXT NOT NULL,
+        status    TEXT NOT NULL,
+        timestamp TEXT NOT NULL,
+        data      TEXT NOT NULL
+    );
+    CREATE INDEX IF NOT EXISTS submissions_by_user ON submissions (username, id);
+    CREATE INDEX IF NOT EXISTS submissions_by_level ON submissions (subject, level, timestamp, id);
+    CREATE INDEX IF NOT EXISTS submissions_by_level_status ON submissions (subject, level, status, timestamp, id);
+    CREATE INDEX IF NOT EXISTS submissions_by_time ON submissions (timestamp, id);
+
+    CREATE TABLE IF NOT EXISTS submission_latest (
+        subject       TEXT NOT NULL,
+        level         TEXT NOT NULL,
+        username      TEXT NOT NULL,
+        submission_id INTEGER NOT NULL,
+        status        TEXT NOT NULL,
+        timestamp     TEXT NOT NULL,
+        PRIMARY KEY (subject, level, username)
+    );
+    CREATE INDEX IF NOT EXISTS submission_latest_by_time ON submission_latest (subject, level, timestamp, submission_id);
+
+    CREATE TABLE IF NOT EXISTS submission_levels (
+        subject  TEXT NOT NULL,
+        level    TEXT NOT NULL,
+        attempts INTEGER NOT NULL DEFAULT 0,
+        passed   INTEGER NOT NULL DEFAULT 0,
+        failed   INTEGER NOT NULL DEFAULT 0,
+        students INTEGER NOT NULL DEFAULT 0,
+        PRIMARY KEY (subject, level)
+    );
+    """
+
+    def __init__(self, db_path: Path = SUBMISSIONS_DB_PATH):
+        self.db = SqliteDb(db_path, self.SCHEMA)
+        conn = self.db.connection()
+        index_empty = conn.execute("SELECT 1 FROM submission_levels LIMIT 1").fetchone() is None
+        if index_empty and not self.is_empty():
+            # Log written before the index tables existed
+            self.rebuild_index()
+
+    def is_empty(self) -> bool:
+        return self.db.connection().execute("SELECT 1 FROM submissions LIMIT 1").fetchone() is None
+
+    def _insert(self, conn, username: str, submission: Dict) -> int:
+        subject = submission.get("subject", "")
+        level = submission.get("level", "")
+        status = submission.get("status", "")
+        timestamp = submission.get("timestamp", "")
+        cursor = conn.execute(
+            "INSERT INTO submissions (username, subject, level, status, timestamp, data) VALUES (?, ?, ?, ?, ?, ?)",
+            (username, subject, level, status, timestamp, json.dumps(submission)),
+        )
+        submission_id = cursor.lastrowid
+        if subject and level:
+            self._index(conn, submission_id, username, subject, level, status, timestamp)
+        return submission_id
+
+    def _index(self, conn, submission_id: int, username: str, subject: str, level: str, status: str, timestamp: str) -> None:
+        """Updates the latest-attempt and per-level count tables for one new submission."""
+        is_new_student = conn.execute(
+            "SELECT 1 FROM submission_latest WHERE subject = ? AND level = ? AND username = ?",
+            (subject, level, username),
+        ).fetchone() is None
+        conn.execute(
+            "INSERT INTO submission_latest (subject, level, username, submission_id, status, timestamp) "
+            "VALUES (?, ?, ?, ?, ?, ?) ON CONFLICT (subject, level, username) DO UPDATE SET "
+            "submission_id = excluded.submission_id, status = excluded.status, timestamp = excluded.timestamp",
+            (subject, level, username, submission_id, status, timestamp),
+        )
+        conn.execute(
+            "INSERT INTO submission_levels (subject, level, attempts, passed, failed, students) "
+            "VALUES (?, ?, 1, ?, ?, ?) ON CONFLICT (subject, level) DO UPDATE SET "
+            "attempts = attempts + 1, passed = passed + excluded.passed, "
+            "failed = failed + excluded.failed, students = students + excluded.students",
+            (subject, level, int(status == "passed"), int(status == "failed"), int(is_new_student)),
+        )
+
+    def rebuild_index(self) -> None:
+        """Recomputes submission_latest and submission_levels from the full log."""
+        with self.db.transaction() as conn:
+            conn.execute("DELETE FROM submission_latest")
+            conn.execute("DELETE FROM submission_levels")
+            rows = conn.execute(
+                "SELECT id, username, subject, level, status, timestamp FROM submissions "
+                "WHERE subject != '' AND level != '' ORDER BY id"
+            ).fetchall()
+            for row in rows:
+                self._index(conn, row["id"], row["username"], row["subject"], row["level"], row["status"], row["timestamp"])
+
+    def append(self, username: str, submission: Dict) -> int:
+        """Appends one submission and returns its id."""
+        with self.db.transaction() as conn:
+            return self._insert(conn, username, submission)
+
+    def for_user(self, username: str) -> List[Dict]:
+        """All submissions of a user, oldest first (same order as the old per-user files)."""
+        rows = self.db.connection().execute(
+            "SELECT data FROM submissions WHERE username = ? ORDER BY id", (username,)
+        )
+        return [json.loads(row["data"]) for row in rows]
+
+    def level_summary(self) -> Dict[str, Dict[str, Dict[str, int]]]:
+        """{subject: {level: {attempts, passed, failed, students}}} from the materialized counts."""
+        summary: Dict[str, Dict[str, Dict[str, int]]] = {}
+        rows = self.db.connection().execute("SELECT * FROM submission_levels ORDER BY subject, level")
+        for row in rows:
+            summary.setdefault(row["subject"], {})[row["level"]] = {
+                "attempts": row["attempts"], "passed": row["passed"],
+                "failed": row["failed"], "students": row["students"],
+            }
+        return summary
+
+    def page(self, subject: Optional[str] = None, level: Optional[str] = None, status: Optional[str] = None,
+             latest_only: bool = False, limit: int = 50, cursor: Optional[str] = None) -> Tuple[List[Dict], Optional[str]]:
+        """
+        One page of submissions, newest first, optionally filtered. With
+        latest_only, only each user's most recent attempt per (subject, level)
+        is returned. Returns (submissions with username, cursor of the next page or None).
+        Pages are read through an index seek, so the cost depends on the page
+        size, not on the size of the history.
+        """
+        limit = max(1, min(int(limit), MAX_PAGE_SIZE))
+        if latest_only:
+            source = "submission_latest l JOIN submissions s ON s.id = l.submission_id"
+            columns = {"subject": "l.subject", "level": "l.level", "status": "l.status",
+                       "timestamp": "l.timestamp", "id": "l.submission_id"}
+        else:
+            source = "submissions s"
+            columns = {"subject": "s.subject", "level": "s.level", "status": "s.status",
+                       "timestamp": "s.timestamp", "id": "s.id"}
+
+        where, params = [], []
+        for name, value in (("subject", subject), ("level", level), ("status", status)):
+            if value:
+                where.append(f"{columns[name]} = ?")
+                params.append(value)
+        if cursor:
+            cursor_timestamp, cursor_id = decode_cursor(cursor)
+            where.append(f"({columns['timestamp']}, {columns['id']}) < (?, ?)")
+            params.extend([cursor_timestamp, cursor_id])
+
+        sql = f"SELECT s.id, s.username, s.timestamp, s.data FROM {source}"
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += f" ORDER BY {columns['timestamp']} DESC, {columns['id']} DESC LIMIT ?"
+        rows = self.db.connection().execute(sql, params + [limit + 1]).fetchall()
+
+        submissions = []
+        for row in rows[:limit]:
+            submission = json.loads(row["data"])
+            submission["username"] = row["username"]
+            submissions.append(submission)
+        next_cursor = encode_cursor(rows[limit - 1]["timestamp"], rows[limit - 1]["id"]) if len(rows) > limit else None
+        return submissions, next_cursor
+
+    def import_json_dir(self, submissions_path: Path = SUBMISSIONS_PATH) -> Tuple[int, int]:
+        """
+        One-shot migration of the legacy data/submissions/<username>.json files.
+        Returns (submissions imported, files that could not be parsed).
+
+        Only imports into an empty log. The check runs inside the write
+        transaction, so workers starting together can't both import.
+        """
+        imported = failed = 0
+        with self.db.transaction() as conn:
+            if conn.execute("SELECT 1 FROM submissions LIMIT 1").fetchone() is not None:
+                return imported, failed
+            for file_path in sorted(submissions_path.glob("*.json")):
+                try:
+                    with open(file_path, "r", encoding="utf-8") as f:
+                        submissions = json.load(f)
+                except (OSError, json.JSONDecodeError) as e:
+                    print(f"[SUBMISSIONS] Skipping {file_path.name}: {e}")
+                    failed += 1
+                    continue
+                for submission in submissions:
+                    if isinstance(submission, dict):
+                        self._insert(conn, file_path.stem, submission)
+                        imported += 1
+        return imported, failed
+
+
+def open_submission_store() -> SubmissionStore:
+    store = SubmissionStore()
+    if store.is_empty() and SUBMISSIONS_PATH.exists():
+        imported, _failed = store.import_json_dir()
+        if imported:
+            print(f"[SUBMISSIONS] Migrated {imported} submissions from {SUBMISSIONS_PATH.name}/ to {SUBMISSIONS_DB_PATH.name}")
+    return store
+
+
+SUBMISSION_STORE = open_submission_store()
@@ -0,0 +1,48 @@
+# backend/utils/tabularFiles.py
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# Binary columnar formats accepted for csv_similarity solution/student files.
+ARROW_SUFFIXES = {".arrow", ".feather", ".ipc"}
+PARQUET_SUFFIXES = {".parquet"}
+NUMPY_SUFFIXES = {".npy"}
+
+
+def is_csv(path: Path) -> bool:
+    return path.suffix.lower() not in ARROW_SUFFIXES | PARQUET_SUFFIXES | NUMPY_SUFFIXES
+
+
+def read_table(path: Path) -> pd.DataFrame:
+    """
+    Loads a tabular file into a DataFrame based on its extension. Binary
+    formats are memory-mapped rather than parsed:
+      .arrow/.feather/.ipc  Arrow IPC file, memory-mapped
+      .parquet              Parquet, read through a memory map
+      .npy                  2-D NumPy array, memory-mapped (columns are 0..n-1)
+      anything else         CSV
+    """
+    suffix = path.suffix.lower()
+    if suffix in ARROW_SUFFIXES:
+        import pyarrow as pa
+        # The map is left open on purpose: zero-copy columns keep referencing it.
+        source = pa.memory_map(str(path), "r")
+        return pa.ipc.open_file(source).read_all().to_pandas()
+    if suffix in PARQUET_SUFFIXES:
+        return pd.read_parquet(path, memory_map=True)
+    if suffix in NUMPY_SUFFIXES:
+        array = np.load(path, mmap_mode="r")
+        if array.ndim == 1:
+            array = array.reshape(-1, 1)
+        return pd.DataFrame(array, copy=False)
+    return pd.read_csv(path)
+
+
+def write_arrow(df: pd.DataFrame, path: Path) -> None:
+    """Writes an uncompressed Arrow IPC file so it can be memory-mapped when read."""
+    import pyarrow as pa
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    with pa.OSFile(str(path), "wb") as sink:
+        with pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
@@ -0,0 +1,298 @@
+# backend/utils/userStore.py
+import os
+import json
+import sqlite3
+import threading
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from utils.sqliteDb import SqliteDb
+from utils.progressHelper import derive_progress, progress_deltas
+from utils.questionCatalog import QUESTION_CATALOG
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+USERS_FILE_PATH = BASE_DIR / "data" / "users.json"
+USERS_DB_PATH = BASE_DIR / "data" / "users.db"
+
+# --- Configuration (overridable through environment variables) ---
+# "sqlite" (default) or "json" for the legacy whole-file users.json store.
+USER_STORE_BACKEND = os.getenv("USER_STORE", "sqlite")
+
+USER_FIELDS = ("username", "password", "role", "progress")
+
+
+def public_user(user: Dict) -> Dict:
+    """
+    Copy of a user record without the password hash, safe to send to clients.
+    Students get their full progress object, derived from the stored deltas.
+    """
+    public = {k: v for k, v in user.items() if k != "password"}
+    if user.get("role") == "student":
+        public["progress"] = derive_progress(user.get("progress"))
+    return public
+
+
+def next_level(subject: str, level: int) -> Optional[str]:
+    """The level directory after `level` if the subject has one in the question catalog."""
+    level_dir = f"level{int(level) + 1}"
+    return level_dir if level_dir in QUESTION_CATALOG.structure().get(subject, []) else None
+
+
+class UserStore(ABC):
+    """
+    Interface shared by the user store backends. Users are plain dicts shaped
+    like the entries of users.json: {"username", "password", "role", "progress"}.
+
+    Only progress deltas are stored (completed levels and unlocked levels past
+    level 1); public_user() derives the full object from the question catalog.
+    Defaults in progress passed to create_users are dropped.
+    """
+
+    @abstractmethod
+    def get_user(self, username: str) -> Optional[Dict]:
+        ...
+
+    @abstractmethod
+    def list_users(self) -> List[Dict]:
+        ...
+
+    @abstractmethod
+    def create_users(self, users: Iterable[Dict]) -> Tuple[List[str], int]:
+        """
+        Inserts all new users in one transaction; returns (usernames created,
+        number skipped because the username already existed).
+        """
+        ...
+
+    def create_user(self, user: Dict) -> bool:
+        """Inserts a user; returns False if the username is taken."""
+        created, _skipped = self.create_users([user])
+        return len(created) == 1
+
+    @abstractmethod
+    def complete_level(self, username: str, subject: str, level: int) -> Optional[Dict]:
+        """
+        Marks `level` of `subject` completed and unlocks the next level if the
+        subject has one and it is not completed yet. Returns the updated user, or None if the user doesn't exist.
+        """
+        ...
+
+# --- SQLite backend ---
+
+class SqliteUserStore(UserStore):
+    """
+    Users live in an indexed `users` table and progress in one row per
+    (username, subject, level), so a progress change touches a single row.
+    The database runs in WAL mode and every write is a transaction.
+    """
+
+    SCHEMA = """
+    CREATE TABLE IF NOT EXISTS users (
+        username TEXT PRIMARY KEY,
+        password TEXT NOT NULL,
+        role     TEXT NOT NULL DEFAULT 'student',
+        extra    TEXT NOT NULL DEFAULT '{}'
+    );
+    CREATE TABLE IF NOT EXISTS progress (
+        username TEXT NOT NULL REFERENCES users(username) ON DELETE CASCADE,
+        subject  TEXT NOT NULL,
+        level    TEXT NOT NULL,
+        status   TEXT NOT NULL,
+        PRIMARY KEY (username, subject, level)
+    );
+    """
+
+    # Bumped with every migration in _migrate(); stored as PRAGMA user_version.
+    SCHEMA_VERSION = 1
+
+    def __init__(self, db_path: Path = USERS_DB_PATH):
+        self.db = SqliteDb(db_path, self.SCHEMA)
+        self._migrate()
+
+    def _migrate(self) -> None:
+        """Runs the data migrations this database has not seen yet, each exactly once."""
+        with self.db.transaction() as conn:
+            version = conn.execute("PRAGMA user_version").fetchone()[0]
+            if version < 1:
+                self._compact_progress(conn)
+            if version < self.SCHEMA_VERSION:
+                conn.execute(f"PRAGMA user_version = {self.SCHEMA_VERSION}")
+
+    @staticmethod
+    def _compact_progress(conn: sqlite3.Connection) -> None:
+        """
+        Drops stored progress rows that equal the derived defaults (full maps
+        from older versions), see is_default_status. Anything else, such as a
+        level 1 an admin locked, is kept.
+        """
+        removed = conn.execute(
+            "DELETE FROM progress WHERE (status = 'locked' AND level <> 'level1') "
+            "OR (status = 'unlocked' AND level = 'level1')"
+        ).rowcount
+        if removed:
+            print(f"[USER STORE] Removed {removed} default progress rows")
+
+    def _row_to_user(self, row: sqlite3.Row, progress_rows: List[sqlite3.Row]) -> Dict:
+        user = {"username": row["username"], "password": row["password"], "role": row["role"]}
+        user.update(json.loads(row["extra"] or "{}"))
+        if row["role"] == "student":
+            progress: Dict[str, Dict[str, str]] = {}
+            for p in progress_rows:
+                progress.setdefault(p["subject"], {})[p["level"]] = p["status"]
+            user["progress"] = progress
+        return user
+
+    def is_empty(self) -> bool:
+        return self.db.connection().execute("SELECT 1 FROM users LIMIT 1").fetchone() is None
+
+    def get_user(self, username: str) -> Optional[Dict]:
+        conn = self.db.connection()
+        row = conn.execute("SELECT * FROM users WHERE username = ?", (username,)).fetchone()
+        if row is None:
+            return None
+        progress_rows = conn.execute(
+            "SELECT subject, level, status FROM progress WHERE username = ? ORDER BY rowid", (username,)
+        ).fetchall()
+        return self._row_to_user(row, progress_rows)
+
+    def list_users(self) -> List[Dict]:
+        conn = self.db.connection()
+        progress_by_user: Dict[str, List[sqlite3.Row]] = {}
+        for p in conn.execute("SELECT username, subject, level, status FROM progress ORDER BY rowid"):
+            progress_by_user.setdefault(p["username"], []).append(p)
+        return [
+            self._row_to_user(row, progress_by_user.get(row["username"], []))
+            for row in conn.execute("SELECT * FROM users ORDER BY rowid")
+        ]
+
+    def create_users(self, users: Iterable[Dict]) -> Tuple[List[str], int]:
+        created: List[str] = []
+        skipped = 0
+        with self.db.transaction() as conn:
+            for user in users:
+                extra = {k: v for k, v in user.items() if k not in USER_FIELDS}
+                cursor = conn.execute(
+                    "INSERT OR IGNORE INTO users (username, password, role, extra) VALUES (?, ?, ?, ?)",
+                    (user["username"], user["password"], user.get("role", "student"), json.dumps(extra)),
+                )
+                if cursor.rowcount == 0:
+                    skipped += 1
+                    continue
+                conn.executemany(
+                    "INSERT INTO progress (username, subject, level, status) VALUES (?, ?, ?, ?)",
+                    [
+                        (user["username"], subject, level, status)
+                        for subject, levels in progress_deltas(user.get("progress")).items()
+                        for level, status in levels.items()
+                    ],
+                )
+                created.append(user["username"])
+        return created, skipped
+
+    def _set_progress(self, conn: sqlite3.Connection, username: str, subject: str, level: str, status: str) -> None:
+        conn.execute(
+            "INSERT INTO progress (username, subject, level, status) VALUES (?, ?, ?, ?) "
+            "ON CONFLICT (username, subject, level) DO UPDATE SET status = excluded.status",
+            (username, subject, level, status),
+        )
+
+    def complete_level(self, username: str, subject: str, level: int) -> Optional[Dict]:
+        with self.db.transaction() as conn:
+            if conn.execute("SELECT 1 FROM users WHERE username = ?", (username,)).fetchone() is None:
+                return None
+            self._set_progress(conn, username, subject, f"level{level}", "completed")
+            next_level_dir = next_level(subject, level)
+            if next_level_dir is not None:
+                conn.execute(
+                    "INSERT INTO progress (username, subject, level, status) VALUES (?, ?, ?, 'unlocked') "
+                    "ON CONFLICT (username, subject, level) DO NOTHING",
+                    (username, subject, next_level_dir),
+                )
+        return self.get_user(username)
+
+    def import_json(self, users_file: Path = USERS_FILE_PATH) -> Tuple[int, int]:
+        """One-shot migration of an existing users.json into this store; returns (created, skipped)."""
+        with open(users_file, "r", encoding="utf-8") as f:
+            users = json.load(f).get("users", [])
+        created, skipped = self.create_users(users)
+        return len(created), skipped
+
+
+# --- Legacy users.json backend ---
+
+class JsonUserStore(UserStore):
+    """
+    The original whole-file users.json store, kept as a fallback. Writes are
+    serialized with a lock and replace the file atomically.
+    """
+
+    def __init__(self, users_file: Path = USERS_FILE_PATH):
+        self.users_file = users_file
+        self._lock = threading.RLock()
+
+    def _load(self) -> Dict:
+        try:
+            with open(self.users_file, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {"users": []}
+
+    def _save(self, data: Dict) -> None:
+        tmp_path = self.users_file.with_suffix(".json.tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=2)
+        os.replace(tmp_path, self.users_file)
+
+    def get_user(self, username: str) -> Optional[Dict]:
+        return next((u for u in self._load().get("users", []) if u["username"] == username), None)
+
+    def list_users(self) -> List[Dict]:
+        return self._load().get("users", [])
+
+    def create_users(self, users: Iterable[Dict]) -> Tuple[List[str], int]:
+        created: List[str] = []
+        skipped = 0
+        with self._lock:
+            data = self._load()
+            existing = {u["username"] for u in data["users"]}
+            for user in users:
+                if user["username"] in existing:
+                    skipped += 1
+                    continue
+                user = dict(user)
+                if user.get("role", "student") == "student":
+                    user["progress"] = progress_deltas(user.get("progress"))
+                data["users"].append(user)
+                existing.add(user["username"])
+                created.append(user["username"])
+            if created:
+                self._save(data)
+        return created, skipped
+
+    def complete_level(self, username: str, subject: str, level: int) -> Optional[Dict]:
+        with self._lock:
+            data = self._load()
+            user = next((u for u in data["users"] if u["username"] == username), None)
+            if user is None:
+                return None
+            subject_progress = user.setdefault("progress", {}).setdefault(subject, {})
+            subject_progress[f"level{level}"] = "completed"
+            next_level_dir = next_level(subject, level)
+            if next_level_dir is not None and subject_progress.get(next_level_dir) != "completed":
+                subject_progress[next_level_dir] = "unlocked"
+            self._save(data)
+            return user
+
+
+def open_user_store() -> UserStore:
+    if USER_STORE_BACKEND == "json":
+        return JsonUserStore()
+    store = SqliteUserStore()
+    if store.is_empty() and USERS_FILE_PATH.exists():
+        created, _skipped = store.import_json()
+        print(f"[USER STORE] Migrated {created} users from {USERS_FILE_PATH.name} to {USERS_DB_PATH.name}")
+    return store
+
+
+USER_STORE = open_user_store()
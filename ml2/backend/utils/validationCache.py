@@ -0,0 +1,91 @@
+# backend/utils/validationCache.py
+import os
+import json
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+# --- Configuration (overridable through environment variables) ---
+VALIDATION_CACHE_SIZE = int(os.getenv("VALIDATION_CACHE_SIZE", "5000"))
+
+CacheKey = Tuple[str, str, str, str, str, str]
+
+
+def normalize_code(code: str) -> str:
+    """Normalizes line endings and surrounding/trailing whitespace so cosmetic edits still hit."""
+    lines = code.replace("\r\n", "\n").replace("\r", "\n").split("\n")
+    return "\n".join(line.rstrip() for line in lines).strip("\n")
+
+
+def sha256_text(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class ValidationCache:
+    """
+    Bounded LRU cache of /validate results, keyed on
+    (subject, level, questionId, partId, hash of normalized code, hash of the
+    question definition). Callers pass the level's questions.json version
+    (its mtime from the question catalog); when it changes, every cached
+    entry for that level is dropped.
+    """
+
+    def __init__(self, max_entries: int = VALIDATION_CACHE_SIZE):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[CacheKey, List[bool]]" = OrderedDict()
+        self._level_versions: Dict[Tuple[str, str], int] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    @staticmethod
+    def make_key(subject: str, level, question_id: str, part_id, code: str, question_definition: Dict) -> CacheKey:
+        definition = json.dumps(question_definition, sort_keys=True, default=str)
+        return (
+            str(subject), str(level), str(question_id), str(part_id or ""),
+            sha256_text(normalize_code(code)), sha256_text(definition),
+        )
+
+    def _check_level_version(self, key: CacheKey, level_version: int) -> None:
+        """Drops every entry of a level whose questions.json changed. Caller holds the lock."""
+        level_key = (key[0], key[1])
+        previous = self._level_versions.get(level_key)
+        if previous is not None and previous != level_version:
+            stale = [k for k in self._entries if (k[0], k[1]) == level_key]
+            for k in stale:
+                del self._entries[k]
+            self.invalidations += len(stale)
+        self._level_versions[level_key] = level_version
+
+    def get(self, key: CacheKey, level_version: int) -> Optional[List[bool]]:
+        with self._lock:
+            self._check_level_version(key, level_version)
+            results = self._entries.get(key)
+            if results is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return list(results)
+
+    def put(self, key: CacheKey, results: List[bool], level_version: int) -> None:
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            self._check_level_version(key, level_version)
+            self._entries[key] = list(results)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "invalidations": self.invalidations,
+            }
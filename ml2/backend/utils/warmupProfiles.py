@@ -0,0 +1,134 @@
+# backend/utils/warmupProfiles.py
+import os
+import json
+import time
+from pathlib import Path
+from typing import Dict, List
+
+from jupyter_client.manager import KernelClient
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+QUESTIONS_BASE_PATH = BASE_DIR / "data" / "questions"
+WARMUP_FILE_NAME = "warmup.json"
+
+# --- Configuration (overridable through environment variables) ---
+# Warmed kernels kept ready per profile unless the profile sets "pool_size".
+KERNEL_WARM_POOL_SIZE = int(os.getenv("KERNEL_WARM_POOL_SIZE", "1"))
+KERNEL_WARMUP_TIMEOUT = int(os.getenv("KERNEL_WARMUP_TIMEOUT", "120"))  # seconds
+
+# Prefix of the single line the warm-up script prints with its step timings.
+WARMUP_RESULT_MARKER = "__KERNEL_WARMUP__"
+
+WARMUP_SCRIPT_TEMPLATE = """
+def _kernel_warmup(_steps):
+    import json, time, importlib
+    timings = []
+    for step in _steps:
+        started = time.perf_counter()
+        error = None
+        try:
+            if step["kind"] == "import":
+                importlib.import_module(step["module"])
+            elif step["kind"] == "dataset":
+                module_name, _, func_name = step["reader"].rpartition(".")
+                reader = getattr(importlib.import_module(module_name), func_name)
+                reader(step["path"], **step.get("kwargs", {{}}))
+            else:
+                exec(compile(step["code"], "<warmup>", "exec"), {{}})
+        except Exception as e:
+            error = f"{{type(e).__name__}}: {{e}}"
+        timing = {{"step": step["label"], "ms": round((time.perf_counter() - started) * 1000, 1)}}
+        if error:
+            timing["error"] = error
+        timings.append(timing)
+    print({marker!r} + json.dumps(timings))
+
+_kernel_warmup(__import__("json").loads({steps!r}))
+del _kernel_warmup
+"""
+
+
+class WarmupProfile:
+    """
+    What a subject's kernels should have done before a student gets one,
+    declared in data/questions/<subject>/warmup.json:
+
+        {
+          "imports": ["pandas", "sklearn.linear_model"],
+          "datasets": [{"path": "data/datasets/house-prices/train.csv", "reader": "pandas.read_csv"}],
+          "code": "optional extra statements",
+          "pool_size": 1
+        }
+
+    Imports land in sys.modules, so the student's own import is a dict hit.
+    Each dataset is read once with its reader, which pulls the file into the
+    page cache and runs the reader's lazily loaded code paths (C parsers,
+    audio decoders, JIT-compiled resamplers). Nothing is left in the
+    student's namespace.
+    """
+
+    def __init__(self, name: str, spec: Dict):
+        self.name = name
+        self.pool_size = int(spec.get("pool_size", KERNEL_WARM_POOL_SIZE))
+        self.steps: List[Dict] = []
+        for module in spec.get("imports", []):
+            self.steps.append({"kind": "import", "label": f"import {module}", "module": module})
+        for dataset in spec.get("datasets", []):
+            if isinstance(dataset, str):
+                dataset = {"path": dataset}
+            path = Path(dataset["path"])
+            if not path.is_absolute():
+                path = BASE_DIR / path
+            self.steps.append({
+                "kind": "dataset",
+                "label": f"load {path.name}",
+                "path": str(path),
+                "reader": dataset.get("reader", "pandas.read_csv"),
+                "kwargs": dataset.get("kwargs", {}),
+            })
+        if spec.get("code"):
+            self.steps.append({"kind": "code", "label": "code", "code": spec["code"]})
+
+    def script(self) -> str:
+        return WARMUP_SCRIPT_TEMPLATE.format(marker=WARMUP_RESULT_MARKER, steps=json.dumps(self.steps))
+
+
+def load_warmup_profiles(base_path: Path = QUESTIONS_BASE_PATH) -> Dict[str, WarmupProfile]:
+    """Profiles keyed by subject, from every data/questions/<subject>/warmup.json."""
+    profiles = {}
+    if not base_path.is_dir():
+        return profiles
+    for spec_path in sorted(base_path.glob(f"*/{WARMUP_FILE_NAME}")):
+        subject = spec_path.parent.name
+        try:
+            with open(spec_path, 'r', encoding='utf-8') as f:
+                profiles[subject] = WarmupProfile(subject, json.load(f))
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            print(f"[WARMUP] Ignoring invalid profile {spec_path}: {e}")
+    if profiles:
+        print(f"[WARMUP] Loaded profiles: {', '.join(profiles)}")
+    return profiles
+
+
+def run_warmup(kc: KernelClient, profile: WarmupProfile, timeout: int = KERNEL_WARMUP_TIMEOUT) -> Dict:
+    """
+    Runs the profile's warm-up in a kernel that has not been handed out yet.
+    Returns {"ms": total wall time, "steps": [{"step", "ms", "error"?}, ...]}.
+    Failing steps are reported, not raised: the kernel is still usable.
+    Raises TimeoutError if the warm-up does not finish in time.
+    """
+    output: List[str] = []
+
+    def collect(msg):
+        if msg['header']['msg_type'] == 'stream' and msg['content'].get('name') == 'stdout':
+            output.append(msg['content']['text'])
+
+    started = time.perf_counter()
+    kc.execute_interactive(profile.script(), store_history=False, timeout=timeout, output_hook=collect)
+    elapsed_ms = round((time.perf_counter() - started) * 1000, 1)
+
+    steps: List[Dict] = []
+    for line in "".join(output).splitlines():
+        if line.startswith(WARMUP_RESULT_MARKER):
+            steps = json.loads(line[len(WARMUP_RESULT_MARKER):])
+    return {"ms": elapsed_ms, "steps": steps}
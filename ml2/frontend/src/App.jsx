@@ -2,7 +2,7 @@
 
 import React, { useState, createContext } from 'react';
 // MODIFICATION: 1. Import useLocation to read the current URL
-import { Routes, Route, Navigate, useLocation } from 'react-router-dom';
+import { Routes, Route, Navigate, useLocation, useNavigate } from 'react-router-dom';
 import LoginPage from './pages/LoginPage/LoginPage';
 import DashboardPage from './pages/DashboardPage/DashboardPage';
 import ExamPage from './pages/ExamPage/ExamPage';
@@ -15,12 +15,35 @@ import Applayout from './Applayout/Applayout';
 // Create a context to hold user authentication state
 export const AuthContext = createContext(null);
 
+// Authorization header carrying the session token issued at login
+export const authHeaders = () => {
+  const token = sessionStorage.getItem('token');
+  return token ? { Authorization: `Bearer ${token}` } : {};
+};
+
+// Set by App: logs the user out when the backend rejects the session token
+let handleUnauthorized = () => {};
+
+// fetch() with the session token. A 401 (token expired or missing) ends the
+// session and sends the user back to the login page.
+export const authFetch = async (url, options = {}) => {
+  const res = await fetch(url, { ...options, headers: { ...options.headers, ...authHeaders() } });
+  if (res.status === 401) handleUnauthorized();
+  return res;
+};
+
 function App() {
   // Try to get user from sessionStorage, otherwise it's null
   const [user, setUser] = useState(() => {
     const savedUser = sessionStorage.getItem('user');
-    return savedUser ? JSON.parse(savedUser) : null;
+    // Sessions saved before login issued tokens can't call the API: log in again
+    if (!savedUser || !sessionStorage.getItem('token')) {
+      sessionStorage.removeItem('user');
+      return null;
+    }
+    return JSON.parse(savedUser);
   });
+  const navigate = useNavigate();
 
   // MODIFICATION: 2. Get the current location object
   // This hook must be used inside a component rendered by your <Router>
@@ -31,16 +54,25 @@ function App() {
   const isExamPage = location.pathname.startsWith('/exam/');
 
 
-  const handleLogin = (userData) => {
+  const handleLogin = (userData, token) => {
     sessionStorage.setItem('user', JSON.stringify(userData));
+    sessionStorage.setItem('token', token);
     setUser(userData);
   };
 
   const handleLogout = () => {
     sessionStorage.removeItem('user');
+    sessionStorage.removeItem('token');
     setUser(null);
   };
 
+  // Assigned while rendering (not in an effect) so it is in place before the
+  // pages' own mount effects send their first requests.
+  handleUnauthorized = () => {
+    handleLogout();
+    navigate('/login', { replace: true, state: { message: 'Your session has expired. Please log in again.' } });
+  };
+
   const updateUserSession = (updatedUserData) => {
       if (user) {
         sessionStorage.setItem('user', JSON.stringify(updatedUserData));
@@ -1,4 +1,5 @@
 import React, {useState, useEffect} from "react";
+import {authFetch} from "../../App";
 import {
   SelectInput,
   TextInput,
@@ -80,7 +81,7 @@ const QuestionManagement = () => {
     };
 
     try {
-      const res = await fetch("http://localhost:3001/api/questions", {
+      const res = await authFetch("http://localhost:3001/api/questions", {
         method: "POST",
         headers: {"Content-Type": "application/json"},
         body: JSON.stringify(payload),
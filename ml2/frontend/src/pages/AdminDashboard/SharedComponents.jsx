@@ -2,6 +2,7 @@
 // These are reusable components used across multiple tabs. Import them where needed.
 
 import React, {useState, useRef, useEffect} from "react";
+import {authFetch} from "../../App";
 
 // Enhanced Spinner component
 export const Spinner = () => (
@@ -379,7 +380,7 @@ export const CSVUploader = ({
     const formData = new FormData();
     formData.append("file", file);
     try {
-      const res = await fetch(`http://localhost:3001/api/admin${endpoint}`, {
+      const res = await authFetch(`http://localhost:3001/api/admin${endpoint}`, {
         method: "POST",
         body: formData,
       });
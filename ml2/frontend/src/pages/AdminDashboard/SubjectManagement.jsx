@@ -1,6 +1,7 @@
 // SubjectManagement.js
 
 import React, { useState } from "react";
+import { authFetch } from "../../App";
 import { TextInput, Button, Alert, Card } from "./SharedComponents"; // Import shared components
 
 const SubjectManagement = () => {
@@ -13,7 +14,7 @@ const SubjectManagement = () => {
     setIsSubmitting(true);
     setMessage({type: "", text: ""});
     try {
-      const res = await fetch(
+      const res = await authFetch(
         "http://localhost:3001/api/admin/create-subject",
         {
           method: "POST",
@@ -1,6 +1,7 @@
 // SubmissionsViewer.js
 
 import React, {useState, useEffect} from "react";
+import {authFetch} from "../../App";
 import {
   Spinner,
   SelectInput,
@@ -172,10 +173,14 @@ const StudentSubmissionDetail = ({username, submissions}) => {
 
 const SubmissionsViewer = () => {
   const [view, setView] = useState("aggregate");
-  const [submissions, setSubmissions] = useState({});
+  const [levelSummary, setLevelSummary] = useState({});
   const [subjects, setSubjects] = useState([]);
   const [selectedSubject, setSelectedSubject] = useState("");
   const [selectedLevel, setSelectedLevel] = useState("");
+  const [latestOnly, setLatestOnly] = useState(false);
+  const [displayedSubmissions, setDisplayedSubmissions] = useState([]);
+  const [nextCursor, setNextCursor] = useState(null);
+  const [isPageLoading, setIsPageLoading] = useState(false);
   const [isAggLoading, setIsAggLoading] = useState(true);
   const [searchUsername, setSearchUsername] = useState("");
   const [studentData, setStudentData] = useState(null);
@@ -183,14 +188,17 @@ const SubmissionsViewer = () => {
   const [studentError, setStudentError] = useState("");
   useEffect(() => {
     if (view === "aggregate") {
-      const fetchAggregateSubmissions = async () => {
+      const fetchLevelSummary = async () => {
         setIsAggLoading(true);
         try {
-          const res = await fetch("http://localhost:3001/api/submissions");
+          // limit=0: only the per subject/level counts, no submissions
+          const res = await authFetch(
+            "http://localhost:3001/api/submissions?limit=0"
+          );
           if (!res.ok) throw new Error("Failed to fetch submission data.");
           const data = await res.json();
-          setSubmissions(data);
-          const availableSubjects = Object.keys(data);
+          setLevelSummary(data.levels);
+          const availableSubjects = Object.keys(data.levels);
           setSubjects(availableSubjects);
           if (availableSubjects.length > 0) {
             setSelectedSubject(availableSubjects[0]);
@@ -201,10 +209,45 @@ const SubmissionsViewer = () => {
           setIsAggLoading(false);
         }
       };
-      fetchAggregateSubmissions();
+      fetchLevelSummary();
     }
   }, [view]);
 
+  const fetchSubmissionsPage = async (cursor) => {
+    setIsPageLoading(true);
+    try {
+      const params = new URLSearchParams({
+        subject: selectedSubject,
+        level: selectedLevel,
+        limit: "50",
+      });
+      if (latestOnly) params.set("latest", "1");
+      if (cursor) params.set("cursor", cursor);
+      const res = await authFetch(
+        `http://localhost:3001/api/submissions?${params.toString()}`
+      );
+      if (!res.ok) throw new Error("Failed to fetch submission data.");
+      const data = await res.json();
+      setDisplayedSubmissions((prev) =>
+        cursor ? [...prev, ...data.submissions] : data.submissions
+      );
+      setNextCursor(data.nextCursor);
+    } catch (error) {
+      console.error("Error fetching submissions page", error);
+    } finally {
+      setIsPageLoading(false);
+    }
+  };
+
+  useEffect(() => {
+    setDisplayedSubmissions([]);
+    setNextCursor(null);
+    if (view === "aggregate" && selectedSubject && selectedLevel) {
+      fetchSubmissionsPage(null);
+    }
+    // eslint-disable-next-line react-hooks/exhaustive-deps
+  }, [view, selectedSubject, selectedLevel, latestOnly]);
+
   const handleStudentSearch = async (e) => {
     e.preventDefault();
     if (!searchUsername) return;
@@ -212,7 +255,7 @@ const SubmissionsViewer = () => {
     setStudentError("");
     setStudentData(null);
     try {
-      const res = await fetch(
+      const res = await authFetch(
         `http://localhost:3001/api/submissions/${searchUsername}`
       );
       const data = await res.json();
@@ -232,7 +275,7 @@ const SubmissionsViewer = () => {
   }));
 
   const levelsForSubject = selectedSubject
-    ? Object.keys(submissions[selectedSubject] || {})
+    ? Object.keys(levelSummary[selectedSubject] || {})
     : [];
 
   const levelOptions = levelsForSubject.map((l) => ({
@@ -240,11 +283,10 @@ const SubmissionsViewer = () => {
     label: l,
   }));
 
-  const displayedSubmissions =
-    (selectedSubject &&
-      selectedLevel &&
-      submissions[selectedSubject]?.[selectedLevel]) ||
-    [];
+  const selectedLevelCounts =
+    selectedSubject && selectedLevel
+      ? levelSummary[selectedSubject]?.[selectedLevel]
+      : null;
 
   return (
     <div className="space-y-6">
@@ -334,6 +376,25 @@ const SubmissionsViewer = () => {
                   />
                 </div>
 
+                <div className="flex flex-wrap items-center justify-between gap-3 mb-4">
+                  <label className="flex items-center gap-2 text-sm text-slate-700">
+                    <input
+                      type="checkbox"
+                      checked={latestOnly}
+                      onChange={(e) => setLatestOnly(e.target.checked)}
+                    />
+                    Latest attempt per student only
+                  </label>
+                  {selectedLevelCounts && (
+                    <p className="text-sm text-slate-600">
+                      {selectedLevelCounts.attempts} attempts by{" "}
+                      {selectedLevelCounts.students} students ·{" "}
+                      {selectedLevelCounts.passed} passed ·{" "}
+                      {selectedLevelCounts.failed} failed
+                    </p>
+                  )}
+                </div>
+
                 <div className="overflow-hidden rounded-lg border border-slate-200">
                   <table className="w-full border-collapse bg-white">
                     <thead className="bg-slate-50">
@@ -412,6 +473,17 @@ const SubmissionsViewer = () => {
                     </tbody>
                   </table>
                 </div>
+                {isPageLoading && <Spinner />}
+                {nextCursor && !isPageLoading && (
+                  <div className="flex justify-center mt-4">
+                    <Button
+                      onClick={() => fetchSubmissionsPage(nextCursor)}
+                      variant="outline"
+                    >
+                      Load more
+                    </Button>
+                  </div>
+                )}
               </>
             )}
           </div>
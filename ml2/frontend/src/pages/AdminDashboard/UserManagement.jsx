@@ -1,6 +1,7 @@
 // UserManagement.js
 
 import React, {useState, useEffect} from "react";
+import {authFetch} from "../../App";
 import {Spinner, CSVUploader, Card} from "./SharedComponents"; // Import shared components
 
 const UserManagement = () => {
@@ -10,7 +11,7 @@ const UserManagement = () => {
   const fetchUsers = async () => {
     setIsLoading(true);
     try {
-      const res = await fetch("http://localhost:3001/api/users");
+      const res = await authFetch("http://localhost:3001/api/users");
       if (res.ok) setUsers(await res.json());
     } catch (error) {
       console.error("Failed to fetch users:", error);
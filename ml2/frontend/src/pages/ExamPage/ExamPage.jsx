@@ -1,7 +1,7 @@
 // components/ExamPage/ExamPage.jsx
 import React, {useState, useEffect, useContext, useCallback} from "react";
 import {useParams, useNavigate} from "react-router-dom";
-import {AuthContext} from "../../App";
+import {AuthContext, authFetch} from "../../App";
 import Spinner from "../Spinner/Spinner";
 import Editor from "@monaco-editor/react";
 import {v4 as uuidv4} from "uuid";
@@ -297,18 +297,16 @@ const ExamPage = () => {
     []
   );
 
-  // Initialize session
-  useEffect(() => {
-    const newSessionId = uuidv4();
-    setSessionId(newSessionId);
-    const startUserSession = async () => {
+  const startUserSession = useCallback(
+    async (id) => {
       try {
-        await fetch("http://localhost:3001/api/evaluate/session/start", {
+        await authFetch("http://localhost:3001/api/evaluate/session/start", {
           method: "POST",
           headers: {"Content-Type": "application/json"},
-          body: JSON.stringify({sessionId: newSessionId}),
+          // The subject picks a kernel pre-warmed with that subject's libraries and datasets.
+          body: JSON.stringify({sessionId: id, subject}),
         });
-        // console.log("Kernel session started:", newSessionId);
+        // console.log("Kernel session started:", id);
       } catch (error) {
         console.error("Failed to start kernel session:", error);
         displayAlert(
@@ -316,17 +314,35 @@ const ExamPage = () => {
           "info"
         );
       }
-    };
-    startUserSession();
-  }, [displayAlert]);
+    },
+    [subject, displayAlert]
+  );
+
+  // The backend shuts down idle kernels; restart the session transparently.
+  const handleSessionExpired = useCallback(async () => {
+    await startUserSession(sessionId);
+    displayAlert(
+      "Your code session expired due to inactivity and has been restarted. Please run your code again.",
+      "info"
+    );
+  }, [sessionId, startUserSession, displayAlert]);
+
+  // Initialize session
+  useEffect(() => {
+    const newSessionId = uuidv4();
+    setSessionId(newSessionId);
+    startUserSession(newSessionId);
+  }, [startUserSession]);
 
   // Fetch questions
   useEffect(() => {
     if (!sessionId) return;
     const fetchAndPrepareQuestions = async () => {
       try {
+        // The session id seeds the level 2/3 pick: it stays the same for the
+        // whole exam session and the response stays cacheable.
         const res = await fetch(
-          `http://localhost:3001/api/questions/${subject}/${level}`
+          `http://localhost:3001/api/questions/${subject}/${level}?seed=${sessionId}`
         );
         let data = await res.json();
 
@@ -432,7 +448,7 @@ const ExamPage = () => {
       : customInputs[questionId] || "";
 
     try {
-      const res = await fetch("http://localhost:3001/api/evaluate/run", {
+      const res = await authFetch("http://localhost:3001/api/evaluate/run", {
         method: "POST",
         headers: {"Content-Type": "application/json"},
         body: JSON.stringify({
@@ -447,6 +463,10 @@ const ExamPage = () => {
         }),
       });
       const result = await res.json();
+      if (result.sessionExpired) {
+        await handleSessionExpired();
+        return;
+      }
       setCellResults((prev) => ({
         ...prev,
         [questionId]: {
@@ -497,7 +517,7 @@ const ExamPage = () => {
     try {
       const question = questions.find((q) => q.id === questionId);
 
-      const res = await fetch("http://localhost:3001/api/evaluate/validate", {
+      const res = await authFetch("http://localhost:3001/api/evaluate/validate", {
         method: "POST",
         headers: {"Content-Type": "application/json"},
         body: JSON.stringify({
@@ -512,6 +532,10 @@ const ExamPage = () => {
       });
 
       const data = await res.json();
+      if (data.sessionExpired) {
+        await handleSessionExpired();
+        return;
+      }
       setCellResults((prev) => ({
         ...prev,
         [questionId]: {
@@ -556,7 +580,7 @@ const ExamPage = () => {
     }));
 
     try {
-      const res = await fetch("http://localhost:3001/api/evaluate/submit", {
+      const res = await authFetch("http://localhost:3001/api/evaluate/submit", {
         method: "POST",
         headers: {"Content-Type": "application/json"},
         body: JSON.stringify({
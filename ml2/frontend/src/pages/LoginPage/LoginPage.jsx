@@ -1,5 +1,5 @@
 import React, {useState, useContext} from "react";
-import {useNavigate} from "react-router-dom";
+import {useNavigate, useLocation} from "react-router-dom";
 import {AuthContext} from "../../App"; // Assuming AuthContext is in your App.js
 import image from "../../assets/ps.png";
 import google from "../../assets/google.png";
@@ -7,7 +7,9 @@ import google from "../../assets/google.png";
 function Login() {
   const [username, setUsername] = useState("");
   const [password, setPassword] = useState("");
-  const [error, setError] = useState("");
+  const location = useLocation();
+  // e.g. "session expired" when an API call was rejected with 401
+  const [error, setError] = useState(location.state?.message || "");
   const {login} = useContext(AuthContext);
   const navigate = useNavigate();
 
@@ -28,7 +30,7 @@ function Login() {
         throw new Error(data.message || "Login failed");
       }
 
-      login(data.user);
+      login(data.user, data.token);
       navigate("/dashboard");
     } catch (err) {
       setError(err.message);